@@ -4,7 +4,7 @@ Příklad použití CCMM datových modelů
 """
 
 from pyccmm.ccmm_models import *
-import xml.etree.ElementTree as ET
+from lxml import etree
 from datetime import date
 
 
@@ -79,7 +79,7 @@ def main():
 
     # Export do XML
     xml_elem = dataset.to_xml_element()
-    xml_str = ET.tostring(xml_elem, encoding='unicode')
+    xml_str = etree.tostring(xml_elem, encoding='unicode')
     print(xml_str)
 
 
@@ -5,34 +5,59 @@ This package provides classes and utilities for working with CCMM metadata,
 including validation, XML generation, and data model definitions.
 """
 
-from .ccmm_models import *
-from .ccmm_handler import CCMMHandler
-from .ccmm_metadata_handler import CCMMMetadataHandler
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "Roman Dvořák, Institute of Physics, Czech Academy of Sciences"
 __email__ = "romandvorak@mlab.cz"
 
-__all__ = [
-    'CCMMHandler',
-    'CCMMMetadataHandler',
-    # Export all models
-    'Dataset',
-    'Title',
-    'Identifier',
-    'Subject',
-    'Description',
-    'Agent',
-    'QualifiedRelation',
-    'TimeReference',
-    'Location',
-    'Distribution',
-    'MetadataRecord',
-    # Export all enums
-    'AgentType',
-    'RoleType',
-    'TimeReferenceType',
-    'DistributionType',
-    'IdentifierScheme',
-    'LanguageCode',
-]
+# Public names and the submodule defining them. Submodules are imported on
+# first attribute access (PEP 562), so that `import pyccmm` does not load lxml
+# or the models until they are used.
+_EXPORTS = {
+    'CCMMHandler': '.ccmm_handler',
+    'CCMMValidationError': '.ccmm_handler',
+    'CCMMMetadataHandler': '.ccmm_metadata_handler',
+    # Models
+    'Dataset': '.ccmm_models',
+    'Identifier': '.ccmm_models',
+    'MultiLanguageText': '.ccmm_models',
+    'AlternateTitle': '.ccmm_models',
+    'Description': '.ccmm_models',
+    'Subject': '.ccmm_models',
+    'Agent': '.ccmm_models',
+    'ResourceToAgentRelationship': '.ccmm_models',
+    'TimeReference': '.ccmm_models',
+    'Location': '.ccmm_models',
+    'Distribution': '.ccmm_models',
+    'TermsOfUse': '.ccmm_models',
+    'MetadataRecord': '.ccmm_models',
+    # Enums
+    'Language': '.ccmm_models',
+    'AgentType': '.ccmm_models',
+    'AgentRole': '.ccmm_models',
+    'IdentifierScheme': '.ccmm_models',
+    'SubjectScheme': '.ccmm_models',
+    'TimeReferenceType': '.ccmm_models',
+    'ResourceType': '.ccmm_models',
+    'LocationType': '.ccmm_models',
+    'DistributionFormat': '.ccmm_models',
+}
+_SUBMODULES = ('ccmm_models', 'ccmm_handler', 'ccmm_metadata_handler', 'schemas')
+
+__all__ = tuple(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
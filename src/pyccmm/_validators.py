@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Validators of field values shared by the CCMM handlers
+"""
+
+from datetime import date
+from functools import lru_cache
+import re
+from urllib.parse import urlparse
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+# Same test as a non-empty urlparse() scheme and netloc: optional leading C0
+# control or space characters, a scheme, "://" and at least one netloc character
+_URI_RE = re.compile(r'[\x00-\x20]*[A-Za-z][A-Za-z0-9+.\-]*://[^/?#]')
+# Input on which urlparse() does more than split the string (removes tabs and
+# newlines, checks IPv6 brackets and NFKC normalized netlocs)
+_URI_URLPARSE_RE = re.compile(r'[\t\r\n\[\]]|[^\x00-\x7f]')
+# Upper bound of publication years, taken once per process
+_MAX_YEAR = date.today().year + 10
+
+
+def validate_non_empty_string(value: str, field_name: str):
+    """Validates that the string is not empty"""
+    if not value or not value.strip():
+        raise ValueError(f"{field_name} cannot be empty.")
+
+
+@lru_cache(maxsize=4096)
+def validate_uri(uri: str):
+    """Validates URI format, results are cached because the same IRIs repeat a lot"""
+    if not uri or not uri.strip():
+        raise ValueError("URI cannot be empty.")
+    if _URI_URLPARSE_RE.search(uri):
+        try:
+            result = urlparse(uri)
+        except ValueError as e:
+            raise ValueError(f"Invalid URI format: {uri} - {e}") from e
+        valid = result.scheme and result.netloc
+    else:
+        valid = _URI_RE.match(uri)
+    if not valid:
+        raise ValueError(f"Invalid URI format: {uri}")
+
+
+@lru_cache(maxsize=4096)
+def validate_email(email: str):
+    """Validates email format"""
+    if not _EMAIL_RE.match(email):
+        raise ValueError(f"Invalid email format: {email}")
+
+
+def validate_year(year: int):
+    """Validates publication year"""
+    if year < 1000 or year > _MAX_YEAR:
+        raise ValueError(f"Publication year must be between 1000 and {_MAX_YEAR}.")
@@ -3,16 +3,51 @@
 CCMM Handler - Handler for working with CCMM metadata using Python objects
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO, Sequence, Tuple, Union
 from datetime import date
-import xml.etree.ElementTree as ET
-from lxml import etree
+from functools import lru_cache, wraps
+import logging
 import os
-import re
-from urllib.parse import urlparse
 
+from lxml import etree
+
+from ._validators import validate_email, validate_non_empty_string, validate_uri, validate_year
 from .ccmm_models import *
-from .schemas import get_schema_path, get_ccmm_root
+from .schemas import get_ccmm_root, load_schema
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=2048)
+def _shared_text(text: str, language: Language) -> MultiLanguageText:
+    """Returns a shared MultiLanguageText instance for repeated (text, language) pairs
+    
+    Sharing is safe because MultiLanguageText is frozen.
+    """
+    return MultiLanguageText(text=text, language=language)
+
+
+class CCMMValidationError(ValueError):
+    """Raised when a dataset does not pass validation
+    
+    Attributes:
+        error_log: lxml error log of the failed XSD validation, or None when the
+            dataset failed before the XSD check. It is kept as is; formatting it
+            is left to the caller.
+    """
+    
+    def __init__(self, message: str, error_log=None):
+        super().__init__(message)
+        self.error_log = error_log
+
+
+def _mutator(method):
+    """Decorator for handler methods changing the dataset, invalidates the cached summary"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._summary_dirty = True
+        return method(self, *args, **kwargs)
+    return wrapper
 
 
 class CCMMHandler:
@@ -31,8 +66,12 @@ class CCMMHandler:
         else:
             self.ccmm_path = ccmm_path
         self.dataset: Optional[Dataset] = None
+        self._cached_summary: Optional[Dict[str, Any]] = None
+        # Error log of the last failed XSD validation
+        self.last_error_log = None
         self._init_empty_dataset()
     
+    @_mutator
     def _init_empty_dataset(self):
         """Initializes empty dataset with minimal requirements"""
         # Create basic terms_of_use
@@ -55,35 +94,42 @@ class CCMMHandler:
     
     # === Basic methods ===
     
+    @_mutator
     def set_title(self, title: str):
         """Sets dataset title"""
         self._validate_non_empty_string(title, "Title")
         self.dataset.title = title
     
+    @_mutator
     def set_publication_year(self, year: int):
         """Sets publication year"""
         self._validate_year(year)
         self.dataset.publication_year = year
     
+    @_mutator
     def set_version(self, version: str):
         """Sets dataset version"""
         self._validate_non_empty_string(version, "Version")
         self.dataset.version = version
     
+    @_mutator
     def set_iri(self, iri: str):
         """Sets dataset IRI"""
         self._validate_uri(iri)
         self.dataset.iri = iri
     
+    @_mutator
     def set_primary_language(self, language: Language):
         """Sets primary language of dataset"""
         self.dataset.primary_language = language
     
+    @_mutator
     def add_other_language(self, language: Language):
         """Adds another language to dataset"""
         if language not in self.dataset.other_languages:
             self.dataset.other_languages.append(language)
     
+    @_mutator
     def set_terms_of_use(self, access_rights: str, license_name: str, description: Optional[str] = None, iri: Optional[str] = None):
         """Sets terms of use"""
         self._validate_non_empty_string(access_rights, "Access rights")
@@ -100,6 +146,7 @@ class CCMMHandler:
     
     # === Identifiers ===
     
+    @_mutator
     def add_identifier(self, value: str, scheme: IdentifierScheme, iri: Optional[str] = None):
         """Adds dataset identifier"""
         self._validate_non_empty_string(value, "Identifier value")
@@ -111,6 +158,7 @@ class CCMMHandler:
     
     # === Descriptions ===
     
+    @_mutator
     def add_description(self, description_text: str, description_type: Optional[str] = None, iri: Optional[str] = None):
         """Adds dataset description"""
         self._validate_non_empty_string(description_text, "Description text")
@@ -126,6 +174,7 @@ class CCMMHandler:
     
     # === Alternate titles ===
     
+    @_mutator
     def add_alternate_title(self, title: str, language: Language = Language.CS, 
                           alternate_title_type: Optional[str] = None, iri: Optional[str] = None):
         """Adds alternate title"""
@@ -133,7 +182,7 @@ class CCMMHandler:
         if iri:
             self._validate_uri(iri)
         
-        title_text = MultiLanguageText(text=title, language=language)
+        title_text = _shared_text(title, language)
         alternate_title = AlternateTitle(
             titles=[title_text],
             alternate_title_type=alternate_title_type,
@@ -143,6 +192,7 @@ class CCMMHandler:
     
     # === Subjects ===
     
+    @_mutator
     def add_subject(self, title: str, language: Language = Language.CS, 
                    classification_code: Optional[str] = None, 
                    subject_scheme: Optional[SubjectScheme] = None,
@@ -153,10 +203,10 @@ class CCMMHandler:
         if iri:
             self._validate_uri(iri)
         
-        title_text = MultiLanguageText(text=title, language=language)
+        title_text = _shared_text(title, language)
         definitions = []
         if definition:
-            definitions.append(MultiLanguageText(text=definition, language=language))
+            definitions.append(_shared_text(definition, language))
         
         subject = Subject(
             titles=[title_text],
@@ -169,6 +219,7 @@ class CCMMHandler:
     
     # === Agents and relationships ===
     
+    @_mutator
     def add_agent_relationship(self, agent_name: str, role: AgentRole, 
                              agent_type: AgentType = AgentType.PERSON,
                              agent_identifier: Optional[Identifier] = None,
@@ -199,6 +250,7 @@ class CCMMHandler:
     
     # === Time references ===
     
+    @_mutator
     def add_time_reference(self, time_value: str, time_type: TimeReferenceType, iri: Optional[str] = None):
         """Adds time reference"""
         self._validate_non_empty_string(time_value, "Time value")
@@ -214,6 +266,7 @@ class CCMMHandler:
     
     # === Locations ===
     
+    @_mutator
     def add_location(self, location_value: str, location_type: LocationType, iri: Optional[str] = None):
         """Adds a location"""
         self._validate_non_empty_string(location_value, "Location value")
@@ -229,6 +282,7 @@ class CCMMHandler:
     
     # === Distribution ===
     
+    @_mutator
     def add_distribution(self, access_url: str, format_type: Optional[DistributionFormat] = None,
                         title: Optional[str] = None, description: Optional[str] = None,
                         iri: Optional[str] = None):
@@ -248,19 +302,24 @@ class CCMMHandler:
     
     # === Metadata Record ===
     
-    def add_metadata_record(self, qualified_relations: List[ResourceToAgentRelationship],
+    @_mutator
+    def add_metadata_record(self, qualified_relations: Sequence[ResourceToAgentRelationship],
                            date_created: Optional[date] = None,
                            date_updated: Optional[List[date]] = None,
                            languages: Optional[List[Language]] = None,
                            iri: Optional[str] = None):
-        """Adds a metadata record"""
+        """Adds a metadata record
+        
+        The record keeps its own copy of qualified_relations, so passing
+        get_agent_relationships() (or a list changed later) is safe.
+        """
         if not qualified_relations:
             raise ValueError("Metadata record must have at least one qualified_relation")
         if iri:
             self._validate_uri(iri)
         
         metadata_record = MetadataRecord(
-            qualified_relations=qualified_relations,
+            qualified_relations=list(qualified_relations),
             date_created=date_created,
             date_updated=date_updated or [],
             languages=languages or [],
@@ -268,10 +327,95 @@ class CCMMHandler:
         )
         self.dataset.metadata_records.append(metadata_record)
     
+    # === Bulk update ===
+    
+    # bulk_update keys mapped to setters taking a single value
+    _BULK_SETTERS = {
+        'title': 'set_title',
+        'publication_year': 'set_publication_year',
+        'version': 'set_version',
+        'iri': 'set_iri',
+        'primary_language': 'set_primary_language',
+        'other_languages': 'add_other_language',
+    }
+    # bulk_update keys mapped to methods called with keyword arguments
+    _BULK_KWARGS = {
+        'terms_of_use': 'set_terms_of_use',
+        'identifiers': 'add_identifier',
+        'descriptions': 'add_description',
+        'alternate_titles': 'add_alternate_title',
+        'subjects': 'add_subject',
+        'agent_relationships': 'add_agent_relationship',
+        'time_references': 'add_time_reference',
+        'locations': 'add_location',
+        'distributions': 'add_distribution',
+        'metadata_records': 'add_metadata_record',
+    }
+    
+    def bulk_update(self, spec: Dict[str, Any]):
+        """Sets many fields at once, e.g. when hydrating a dataset from a dict
+        
+        Keys are applied in order. 'title', 'publication_year', 'version', 'iri' and
+        'primary_language' take a value, 'other_languages' a list of languages and
+        'terms_of_use' a dict of set_terms_of_use arguments. The remaining keys
+        ('identifiers', 'descriptions', 'alternate_titles', 'subjects',
+        'agent_relationships', 'time_references', 'locations', 'distributions',
+        'metadata_records') take a list of keyword-argument dicts for the matching
+        add_* method.
+        
+        Unknown keys, malformed entries and invalid URIs are reported before
+        anything is changed; each distinct URI is validated only once. The other
+        checks (year, language, ...) run as the keys are applied in order, so a
+        ValueError raised by them leaves the preceding keys applied.
+        """
+        unknown = [key for key in spec if key not in self._BULK_SETTERS and key not in self._BULK_KWARGS]
+        if unknown:
+            raise ValueError(f"Unknown bulk update keys: {', '.join(unknown)}")
+        
+        # Collect URIs from all entries first (dict keeps order and drops duplicates)
+        uris = {}
+        if spec.get('iri'):
+            uris[spec['iri']] = None
+        for key in self._BULK_KWARGS:
+            if key not in spec:
+                continue
+            entries = spec[key]
+            if key == 'terms_of_use':
+                entries = [entries]
+            if not isinstance(entries, (list, tuple)) or not all(isinstance(kwargs, dict) for kwargs in entries):
+                raise ValueError(f"Bulk update key '{key}' expects "
+                                 f"{'a dict' if key == 'terms_of_use' else 'a list of dicts'}")
+            for kwargs in entries:
+                for uri_arg in ('iri', 'access_url'):
+                    if kwargs.get(uri_arg):
+                        uris[kwargs[uri_arg]] = None
+        for uri in uris:
+            validate_uri(uri)
+        
+        for key, value in spec.items():
+            try:
+                if key == 'other_languages':
+                    for language in value:
+                        self.add_other_language(language)
+                elif key in self._BULK_SETTERS:
+                    getattr(self, self._BULK_SETTERS[key])(value)
+                elif key == 'terms_of_use':
+                    self.set_terms_of_use(**value)
+                else:
+                    add = getattr(self, self._BULK_KWARGS[key])
+                    for kwargs in value:
+                        add(**kwargs)
+            except (AttributeError, TypeError) as e:
+                raise ValueError(f"Invalid bulk update value for '{key}': {e}") from e
+    
     # === Validation ===
     
     def is_valid(self) -> bool:
         """Checks if the dataset is valid"""
+        return self._is_valid()
+    
+    def _is_valid(self, xml_elem=None) -> bool:
+        """Checks the required content, then the given (or a freshly built) tree against the XSD"""
         try:
             # Basic validation
             if not self.dataset.title.strip():
@@ -288,100 +432,84 @@ class CCMMHandler:
                 return False
             
             # XSD validation
-            return self._validate_against_xsd()
+            return self._validate_against_xsd(xml_elem)
         except Exception as e:
-            print(f"Validation error: {e}")
+            logger.debug("Validation error: %s", e)
             return False
     
-    def _validate_against_xsd(self) -> bool:
+    def _get_schema(self) -> etree.XMLSchema:
+        """Returns the compiled dataset XSD schema, shared by all handlers"""
+        return load_schema(os.path.join(self.ccmm_path, "dataset", "schema.xsd"))
+    
+    def _validate_against_xsd(self, xml_elem=None) -> bool:
         """Validation against XSD schema"""
         try:
-            xml_elem = self.dataset.to_xml_element()
-            xml_string = ET.tostring(xml_elem, encoding='unicode')
-            
-            xsd_path = get_schema_path("dataset")
-            with open(xsd_path, 'r') as f:
-                schema = etree.XMLSchema(etree.parse(f))
-            
-            xml_doc = etree.fromstring(xml_string)
-            is_valid = schema.validate(xml_doc)
+            if xml_elem is None:
+                xml_elem = self._build_lxml_tree()
+            schema = self._get_schema()
+            is_valid = schema.validate(xml_elem)
             
+            # The log is only formatted if debug logging is actually enabled
+            self.last_error_log = None if is_valid else schema.error_log
             if not is_valid:
-                print(f"XSD validation errors: {schema.error_log}")
+                logger.debug("XSD validation errors: %s", self.last_error_log)
             
             return is_valid
         except Exception as e:
-            print(f"XSD validation error: {e}")
+            logger.debug("XSD validation error: %s", e)
             return False
     
     # === Export/Import ===
     
+    def _build_lxml_tree(self):
+        """Builds the lxml tree of the dataset, shared by validation and export"""
+        return self.dataset.to_lxml_element()
+    
     def to_xml_string(self, pretty_print: bool = True) -> str:
         """Converts the dataset to an XML string"""
-        xml_elem = self.dataset.to_xml_element()
-        xml_string = ET.tostring(xml_elem, encoding='unicode')
-        
-        if pretty_print:
-            # Reformat for better readability
-            root = etree.fromstring(xml_string)
-            return etree.tostring(root, pretty_print=True, encoding='unicode')
+        root = self._build_lxml_tree()
+        return etree.tostring(root, pretty_print=pretty_print, xml_declaration=False, encoding='unicode')
+    
+    def save_to_file(self, file_path: Union[str, os.PathLike, BinaryIO], validate: bool = True):
+        """Saves the dataset to an XML file
         
-        return xml_string
-    def save_to_file(self, file_path: str, validate: bool = True):
-        """Saves the dataset to an XML file"""
-        if validate and not self.is_valid():
-            raise ValueError("Dataset is not valid. Fix validation errors before saving.")
+        The document is serialized by libxml2 straight into the target, without
+        building the whole XML string in memory first.
         
-        xml_elem = self.dataset.to_xml_element()
+        Args:
+            file_path: Path of the output file, or a file object opened in binary mode
+            validate: Validate the dataset before writing
         
-        # Reformat for better readability
-        xml_string = ET.tostring(xml_elem, encoding='unicode')
-        root = etree.fromstring(xml_string)
+        Raises:
+            CCMMValidationError: If validate is set and the dataset is not valid
+        """
+        # Build the tree once, validate it in place and write that same tree
+        root = self._build_lxml_tree()
+        if validate:
+            self.last_error_log = None
+            if not self._is_valid(root):
+                raise CCMMValidationError("Dataset is not valid. Fix validation errors before saving.",
+                                          self.last_error_log)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            f.write(etree.tostring(root, pretty_print=True, encoding='unicode'))
+        tree = etree.ElementTree(root)
+        tree.write(file_path, pretty_print=True, xml_declaration=True, encoding='UTF-8')
     
     def load_from_file(self, file_path: str) -> bool:
-        """Loads the dataset from an XML file"""
-        try:
-            # TODO: Implement parsing XML back into Python objects
-            print("Load from file is not implemented yet")
-            return False
-        except Exception as e:
-            print(f"Error loading file: {e}")
-            return False
+        """Loads the dataset from an XML file
+        
+        Not implemented yet: the dataset is left unchanged and False is returned.
+        """
+        # TODO: Implement parsing XML back into Python objects
+        logger.warning("Load from file is not implemented yet")
+        return False
     
     # === Validation methods ===
     
-    def _validate_non_empty_string(self, value: str, field_name: str):
-        """Validates that the string is not empty"""
-        if not value or not value.strip():
-            raise ValueError(f"{field_name} cannot be empty.")
-    
-    def _validate_uri(self, uri: str):
-        """Validates URI format"""
-        if not uri or not uri.strip():
-            raise ValueError("URI cannot be empty.")
-        try:
-            result = urlparse(uri)
-            if not result.scheme or not result.netloc:
-                raise ValueError(f"Invalid URI format: {uri}")
-        except Exception as e:
-            raise ValueError(f"Invalid URI format: {uri} - {e}")
-    
-    def _validate_year(self, year: int):
-        """Validates publication year"""
-        from datetime import datetime
-        current_year = datetime.now().year
-        if year < 1000 or year > current_year + 10:
-            raise ValueError(f"Publication year must be between 1000 and {current_year + 10}.")
-    
-    def _validate_email(self, email: str):
-        """Validates email format"""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            raise ValueError(f"Invalid email format: {email}")
+    # Shared with the metadata handler, see _validators
+    _validate_non_empty_string = staticmethod(validate_non_empty_string)
+    _validate_uri = staticmethod(validate_uri)
+    _validate_year = staticmethod(validate_year)
+    _validate_email = staticmethod(validate_email)
     
     # === Getters ===
     
@@ -409,21 +537,38 @@ class CCMMHandler:
         """Returns the list of distributions"""
         return self.dataset.distributions
     
-    def get_agent_relationships(self) -> List[ResourceToAgentRelationship]:
-        """Returns the list of agent relationships"""
-        return self.dataset.qualified_relations
+    def get_agent_relationships(self) -> Tuple[ResourceToAgentRelationship, ...]:
+        """Returns the agent relationships as a read-only tuple"""
+        return tuple(self.dataset.qualified_relations)
     
     def get_summary(self) -> Dict[str, Any]:
-        """Returns a summary of the dataset"""
+        """Returns a summary of the dataset
+        
+        The collection counts are taken from the dataset lists on every call. The
+        other values are cached and rebuilt only after a set_*/add_* call, so changes
+        made directly on self.dataset (e.g. assigning its title) are not reflected
+        until the next such call.
+        """
+        if self._summary_dirty:
+            self._cached_summary = {
+                'title': self.dataset.title,
+                'publication_year': self.dataset.publication_year,
+                'version': self.dataset.version,
+                'primary_language': self.dataset.primary_language.value if self.dataset.primary_language else None,
+                'other_languages': [lang.value for lang in self.dataset.other_languages]
+            }
+            self._summary_dirty = False
+        cached = self._cached_summary
         return {
-            'title': self.dataset.title,
-            'publication_year': self.dataset.publication_year,
-            'version': self.dataset.version,
+            'title': cached['title'],
+            'publication_year': cached['publication_year'],
+            'version': cached['version'],
             'identifiers_count': len(self.dataset.identifiers),
             'descriptions_count': len(self.dataset.descriptions),
             'subjects_count': len(self.dataset.subjects),
             'agents_count': len(self.dataset.qualified_relations),
             'distributions_count': len(self.dataset.distributions),
-            'primary_language': self.dataset.primary_language.value if self.dataset.primary_language else None,
-            'other_languages': [lang.value for lang in self.dataset.other_languages]
-        }
+            'primary_language': cached['primary_language'],
+            # Copied so callers cannot change the cache
+            'other_languages': list(cached['other_languages'])
+        }
\ No newline at end of file
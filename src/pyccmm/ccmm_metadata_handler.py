@@ -1,15 +1,35 @@
-import xml.etree.ElementTree as ET
 from lxml import etree
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Iterator
+import logging
 import os
-import re
-from datetime import datetime
-from urllib.parse import urlparse
+from collections import defaultdict
+
+from ._validators import validate_email, validate_uri, validate_year
+from .schemas import load_schema
+
+logger = logging.getLogger(__name__)
 
 class CCMMMetadataHandler:
+    # XSD sequence order according to dataset/schema.xsd
+    _XSD_ORDER = (
+        'iri', 'publication_year', 'version', 'title', 'has_description', 'alternate_title',
+        'is_described_by', 'identifier', 'location', 'provenance', 'qualified_relation',
+        'time_reference', 'subject', 'validation_result', 'distribution', 'funding_reference',
+        'terms_of_use', 'related_resource', 'resource_type', 'other_language', 'primary_language'
+    )
+    _XSD_ORDER_INDEX = {name: index for index, name in enumerate(_XSD_ORDER)}
+    # Top level elements the setters keep at most one of
+    _SINGLE_TAGS = frozenset(('title', 'publication_year', 'version'))
+
     def __init__(self, ccmm_path: str = "./schemas/CCMM"):
         self.ccmm_path = ccmm_path
-        self.metadata = ET.Element('dataset')
+        self.metadata = etree.Element('dataset')
+        # Error log of the last failed XSD validation
+        self.last_error_log = None
+        # Whether the children of self.metadata are known to be in XSD order
+        self._reordered = True
+        # Elements of _SINGLE_TAGS by tag, so setters do not have to search for them
+        self._single_elems: Dict[str, etree._Element] = {}
         self.required_fields = {
             'title': False,
             'publication_year': False,
@@ -21,129 +41,150 @@ class CCMMMetadataHandler:
         self._validate_identifier(scheme)
         if iri:
             self._validate_uri(iri)
-        identifier = ET.SubElement(self.metadata, 'identifier')
-        ET.SubElement(identifier, 'value').text = value
-        ET.SubElement(identifier, 'scheme').text = scheme
+        identifier = self._add_child('identifier')
+        etree.SubElement(identifier, 'value').text = value
+        etree.SubElement(identifier, 'scheme').text = scheme
         if iri:
-            ET.SubElement(identifier, 'iri').text = iri
+            etree.SubElement(identifier, 'iri').text = iri
         self.required_fields['identifier'] = True
 
     def add_description(self, text: str):
         if not text.strip():
             raise ValueError("Description cannot be empty.")
-        description = ET.SubElement(self.metadata, 'has_description')
-        ET.SubElement(description, 'description_text').text = text
+        description = self._add_child('has_description')
+        etree.SubElement(description, 'description_text').text = text
 
     def validate_against_xsd(self, xsd_file: str):
         xsd_path = os.path.join(self.ccmm_path, xsd_file)
-        with open(xsd_path, 'r') as f:
-            schema = etree.XMLSchema(etree.parse(f))
-        xml_string = ET.tostring(self.metadata, encoding='unicode')
-        xml_doc = etree.fromstring(xml_string)
-        is_valid = schema.validate(xml_doc)
+        return self._validate_with_schema(load_schema(xsd_path))
+
+    def iter_errors(self, xsd_file: str = "dataset/schema.xsd") -> Iterator[etree._LogEntry]:
+        """Validate against an XSD schema and yield the validation errors."""
+        if not self.validate_against_xsd(xsd_file):
+            yield from self.last_error_log
+
+    def _validate_with_schema(self, schema: etree.XMLSchema) -> bool:
+        # The metadata is already an lxml tree, no need to serialize and reparse it
+        is_valid = schema.validate(self.metadata)
+        # Kept unformatted, the log is only turned into text if debug logging is on
+        self.last_error_log = None if is_valid else schema.error_log
         if not is_valid:
-            print(f"XSD validation errors: {schema.error_log}")
+            logger.debug("XSD validation errors: %s", self.last_error_log)
         return is_valid
 
     def load_from_file(self, xml_file_path: str) -> bool:
         try:
-            tree = ET.parse(xml_file_path)
+            # Drop indentation whitespace, so pretty printing can indent the tree again
+            tree = etree.parse(xml_file_path, etree.XMLParser(remove_blank_text=True))
             self.metadata = tree.getroot()
+            self._reordered = False
+            self._single_elems = {}
+            for child in self.metadata:
+                if child.tag in self._SINGLE_TAGS:
+                    self._single_elems.setdefault(child.tag, child)
             return True
         except Exception as e:
-            print(f"Error loading file: {e}")
+            logger.warning("Error loading file: %s", e)
             return False
     
+    def load_summary_from_file(self, xml_file_path: str) -> Dict[str, Any]:
+        """Read the required fields of an XML file without keeping the whole tree.
+        
+        Returns the title and publication_year texts (None when missing) and the
+        identifiers as a list of dicts, in the form of get_all_fields. Elements are
+        dropped as soon as they are read and the handler's metadata is not changed.
+        """
+        summary = {'title': None, 'publication_year': None, 'identifier': []}
+        for _, elem in etree.iterparse(xml_file_path, events=('end',)):
+            parent = elem.getparent()
+            # Only top level elements, <title> also appears inside alternate_title
+            if parent is None or parent.getparent() is not None:
+                continue
+            tag = elem.tag
+            if tag == 'identifier':
+                summary['identifier'].append({child.tag: child.text for child in elem})
+            elif tag in ('title', 'publication_year') and summary[tag] is None:
+                summary[tag] = elem.text
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+        return summary
+
     def set_title(self, title: str):
         """Set the title of the dataset."""
         if not title.strip():
             raise ValueError("Title cannot be empty.")
-        existing_title = self.metadata.find('title')
-        if existing_title is not None:
-            existing_title.text = title
-        else:
-            ET.SubElement(self.metadata, 'title').text = title
+        self._set_single('title', title)
         self.required_fields['title'] = True
 
     def set_publication_year(self, year: int):
         """Set the publication year of the dataset."""
         self._validate_year(year)
-        existing_year = self.metadata.find('publication_year')
-        if existing_year is not None:
-            existing_year.text = str(year)
-        else:
-            ET.SubElement(self.metadata, 'publication_year').text = str(year)
+        self._set_single('publication_year', str(year))
         self.required_fields['publication_year'] = True
 
     def set_version(self, version: str):
         """Set the version of the dataset."""
         self._validate_non_empty_string(version, "Version")
-        existing_version = self.metadata.find('version')
-        if existing_version is not None:
-            existing_version.text = version
-        else:
-            ET.SubElement(self.metadata, 'version').text = version
+        self._set_single('version', version)
 
     def add_alternate_title(self, title: str, title_type: Optional[str] = None):
         """Add an alternate title to the dataset."""
         self._validate_non_empty_string(title, "Alternate title")
-        alternate_title = ET.SubElement(self.metadata, 'alternate_title')
-        ET.SubElement(alternate_title, 'title').text = title
+        alternate_title = self._add_child('alternate_title')
+        etree.SubElement(alternate_title, 'title').text = title
         if title_type:
             self._validate_non_empty_string(title_type, "Title type")
-            ET.SubElement(alternate_title, 'title_type').text = title_type
+            etree.SubElement(alternate_title, 'title_type').text = title_type
 
     def add_subject(self, subject: str, scheme: Optional[str] = None):
         """Add a subject/keyword to the dataset."""
         self._validate_non_empty_string(subject, "Subject")
-        subject_elem = ET.SubElement(self.metadata, 'subject')
-        ET.SubElement(subject_elem, 'subject_value').text = subject
+        subject_elem = self._add_child('subject')
+        etree.SubElement(subject_elem, 'subject_value').text = subject
         if scheme:
             self._validate_non_empty_string(scheme, "Subject scheme")
-            ET.SubElement(subject_elem, 'subject_scheme').text = scheme
+            etree.SubElement(subject_elem, 'subject_scheme').text = scheme
 
     def add_agent_relationship(self, agent_name: str, role: str, agent_type: str = "person"):
         """Add an agent relationship (e.g., creator, contributor)."""
         self._validate_non_empty_string(agent_name, "Agent name")
         self._validate_non_empty_string(role, "Role")
         self._validate_non_empty_string(agent_type, "Agent type")
-        relationship = ET.SubElement(self.metadata, 'qualified_relation')
-        ET.SubElement(relationship, 'agent_name').text = agent_name
-        ET.SubElement(relationship, 'role').text = role
-        ET.SubElement(relationship, 'agent_type').text = agent_type
+        relationship = self._add_child('qualified_relation')
+        etree.SubElement(relationship, 'agent_name').text = agent_name
+        etree.SubElement(relationship, 'role').text = role
+        etree.SubElement(relationship, 'agent_type').text = agent_type
 
     def add_distribution(self, access_url: str, format_type: Optional[str] = None):
         """Add a distribution (access point) for the dataset."""
         self._validate_uri(access_url)
-        distribution = ET.SubElement(self.metadata, 'distribution')
-        ET.SubElement(distribution, 'access_url').text = access_url
+        distribution = self._add_child('distribution')
+        etree.SubElement(distribution, 'access_url').text = access_url
         if format_type:
             self._validate_non_empty_string(format_type, "Format type")
-            ET.SubElement(distribution, 'format').text = format_type
+            etree.SubElement(distribution, 'format').text = format_type
 
     def add_location(self, location: str, location_type: Optional[str] = None):
         """Add a geographical location for the dataset."""
         self._validate_non_empty_string(location, "Location")
-        location_elem = ET.SubElement(self.metadata, 'location')
-        ET.SubElement(location_elem, 'location_value').text = location
+        location_elem = self._add_child('location')
+        etree.SubElement(location_elem, 'location_value').text = location
         if location_type:
             self._validate_non_empty_string(location_type, "Location type")
-            ET.SubElement(location_elem, 'location_type').text = location_type
+            etree.SubElement(location_elem, 'location_type').text = location_type
 
     def add_time_reference(self, time_value: str, time_type: str = "created"):
         """Add a time reference for the dataset."""
         self._validate_non_empty_string(time_value, "Time value")
         self._validate_non_empty_string(time_type, "Time type")
-        time_ref = ET.SubElement(self.metadata, 'time_reference')
-        ET.SubElement(time_ref, 'time_value').text = time_value
-        ET.SubElement(time_ref, 'time_type').text = time_type
+        time_ref = self._add_child('time_reference')
+        etree.SubElement(time_ref, 'time_value').text = time_value
+        etree.SubElement(time_ref, 'time_type').text = time_type
 
     def validate_required_fields(self) -> Dict[str, bool]:
         """Validate that all required fields are present."""
-        validation_result = {}
-        for field, is_set in self.required_fields.items():
-            validation_result[field] = is_set
-        return validation_result
+        return self.required_fields.copy()
 
     def is_valid(self) -> bool:
         """Check if all required fields are filled and validate against XSD schema."""
@@ -151,46 +192,30 @@ class CCMMMetadataHandler:
         if not all(self.required_fields.values()):
             return False
         
+        # Get the schema first, a missing or broken one fails without reordering
+        try:
+            schema = load_schema(os.path.join(self.ccmm_path, "dataset/schema.xsd"))
+        except Exception as e:
+            logger.debug("XSD validation error: %s", e)
+            return False
+        
         # Reorder elements before validation
         self._reorder_elements()
         
         # Validate against XSD schema
-        try:
-            return self.validate_against_xsd("dataset/schema.xsd")
-        except Exception as e:
-            print(f"XSD validation error: {e}")
-            return False
+        return self._validate_with_schema(schema)
 
     def to_xml_string(self, pretty_print: bool = True) -> str:
         """Convert metadata to XML string."""
         # Reorder elements to match XSD schema
         self._reorder_elements()
-        if pretty_print:
-            self._indent(self.metadata)
-        return ET.tostring(self.metadata, encoding='unicode')
+        return etree.tostring(self.metadata, pretty_print=pretty_print, encoding='unicode')
 
     def save_to_file(self, file_path: str):
         """Save metadata to XML file."""
         self._reorder_elements()
-        self._indent(self.metadata)
-        tree = ET.ElementTree(self.metadata)
-        tree.write(file_path, encoding='utf-8', xml_declaration=True)
-
-    def _indent(self, elem, level=0):
-        """Helper method to format XML with proper indentation."""
-        i = "\n" + level * "  "
-        if len(elem):
-            if not elem.text or not elem.text.strip():
-                elem.text = i + "  "
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-            for elem in elem:
-                self._indent(elem, level + 1)
-            if not elem.tail or not elem.tail.strip():
-                elem.tail = i
-        else:
-            if level and (not elem.tail or not elem.tail.strip()):
-                elem.tail = i
+        tree = etree.ElementTree(self.metadata)
+        tree.write(file_path, pretty_print=True, encoding='utf-8', xml_declaration=True)
 
     def get_field_value(self, field_name: str) -> Optional[str]:
         """Get the value of a specific field."""
@@ -199,18 +224,13 @@ class CCMMMetadataHandler:
 
     def get_all_fields(self) -> Dict[str, Any]:
         """Get all fields as a dictionary."""
-        result = {}
+        result = defaultdict(list)
         for child in self.metadata:
-            if child.tag not in result:
-                result[child.tag] = []
-            if len(child) > 0:
-                child_dict = {}
-                for grandchild in child:
-                    child_dict[grandchild.tag] = grandchild.text
-                result[child.tag].append(child_dict)
+            if len(child):
+                result[child.tag].append({grandchild.tag: grandchild.text for grandchild in child})
             else:
                 result[child.tag].append(child.text)
-        return result
+        return dict(result)
     
     def _validate_identifier(self, identifier: str):
         """Validate identifier format."""
@@ -219,69 +239,47 @@ class CCMMMetadataHandler:
         if len(identifier) > 255:
             raise ValueError("Identifier is too long (max 255 characters).")
     
-    def _validate_uri(self, uri: str):
-        """Validate URI format."""
-        if not uri or not uri.strip():
-            raise ValueError("URI cannot be empty.")
-        try:
-            result = urlparse(uri)
-            if not result.scheme or not result.netloc:
-                raise ValueError(f"Invalid URI format: {uri}")
-        except Exception as e:
-            raise ValueError(f"Invalid URI format: {uri} - {e}")
+    # Compiled scheme://netloc check, shared with CCMMHandler
+    _validate_uri = staticmethod(validate_uri)
     
-    def _validate_year(self, year: int):
-        """Validate publication year."""
-        current_year = datetime.now().year
-        if year < 1000 or year > current_year + 10:
-            raise ValueError(f"Publication year must be between 1000 and {current_year + 10}.")
+    # Upper bound computed once at import
+    _validate_year = staticmethod(validate_year)
     
-    def _validate_email(self, email: str):
-        """Validate email format."""
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            raise ValueError(f"Invalid email format: {email}")
+    # Precompiled pattern, shared with CCMMHandler
+    _validate_email = staticmethod(validate_email)
     
     def _validate_non_empty_string(self, value: str, field_name: str):
         """Validate that string is not empty."""
         if not value or not value.strip():
             raise ValueError(f"{field_name} cannot be empty.")
     
+    def _add_child(self, tag: str):
+        """Append a new top level element to the metadata."""
+        self._reordered = False
+        return etree.SubElement(self.metadata, tag)
+    
+    def _set_single(self, tag: str, text: str):
+        """Set the text of a top level element that occurs once, creating it if missing."""
+        elem = self._single_elems.get(tag)
+        # The cached element may have been removed or self.metadata replaced
+        if elem is None or elem.getparent() is not self.metadata:
+            elem = self.metadata.find(tag)
+            if elem is None:
+                elem = self._add_child(tag)
+            self._single_elems[tag] = elem
+        elem.text = text
+    
     def _reorder_elements(self):
-        """Reorder elements to match XSD schema sequence."""
-        # XSD sequence order according to dataset/schema.xsd
-        xsd_order = [
-            'iri', 'publication_year', 'version', 'title', 'has_description', 'alternate_title',
-            'is_described_by', 'identifier', 'location', 'provenance', 'qualified_relation',
-            'time_reference', 'subject', 'validation_result', 'distribution', 'funding_reference',
-            'terms_of_use', 'related_resource', 'resource_type', 'other_language', 'primary_language'
-        ]
-        
-        # Map our element names to XSD names
-        element_mapping = {
-            'has_description': 'has_description',
-            'alternate_title': 'alternate_title',
-            'identifier': 'identifier',
-            'location': 'location',
-            'qualified_relation': 'qualified_relation',
-            'time_reference': 'time_reference',
-            'subject': 'subject',
-            'distribution': 'distribution'
-        }
-        
-        # Collect all elements
-        elements = {}
-        for child in list(self.metadata):
-            mapped_name = element_mapping.get(child.tag, child.tag)
-            if mapped_name not in elements:
-                elements[mapped_name] = []
-            elements[mapped_name].append(child)
-        
-        # Clear all children
-        self.metadata.clear()
+        """Reorder elements to match XSD schema sequence.
         
-        # Add elements in XSD order
-        for element_name in xsd_order:
-            if element_name in elements:
-                for element in elements[element_name]:
-                    self.metadata.append(element)
+        Skipped when nothing was added since the last reorder. Elements appended
+        to self.metadata directly are not tracked.
+        """
+        if self._reordered:
+            return
+        # Stable sort keeps elements with the same tag in insertion order,
+        # tags unknown to the schema go last
+        order = self._XSD_ORDER_INDEX
+        unknown = len(order)
+        self.metadata[:] = sorted(self.metadata, key=lambda child: order.get(child.tag, unknown))
+        self._reordered = True
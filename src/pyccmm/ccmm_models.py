@@ -7,7 +7,40 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from enum import Enum
 from datetime import date, datetime
-import xml.etree.ElementTree as ET
+import sys
+
+from lxml import etree
+
+# dataclass(slots=True) needs Python 3.10+, older versions keep the per-instance __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# xml:lang attribute in Clark notation
+_XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+
+def _new_element(builder, parent, tag: str):
+    """Creates tag as a child of parent (in the parent's document), or as a new root"""
+    if parent is None:
+        return builder.Element(tag)
+    return builder.SubElement(parent, tag)
+
+
+def _leaf(builder, parent, tag: str, text: str, attrib=None):
+    """Creates a child element of parent holding text"""
+    if attrib is None:
+        elem = builder.SubElement(parent, tag)
+    else:
+        elem = builder.SubElement(parent, tag, attrib)
+    elem.text = text
+    return elem
+
+
+def _iri_wrap(builder, parent, tag: str, iri: str):
+    """Creates a child element of parent wrapping a single <iri>"""
+    elem = builder.SubElement(parent, tag)
+    builder.SubElement(elem, "iri").text = iri
+    return elem
+
 
 # Enums for valid values
 class Language(Enum):
@@ -78,87 +111,93 @@ class DistributionFormat(Enum):
     HTML = "text/html"
     PLAIN_TEXT = "text/plain"
 
+# Serialized value of every enum member, looked up by the XML builders instead of
+# going through the Enum.value descriptor for each element
+_XML_VALUES = {
+    member: member.value
+    for enum_class in (Language, AgentType, AgentRole, IdentifierScheme, SubjectScheme,
+                       TimeReferenceType, ResourceType, LocationType, DistributionFormat)
+    for member in enum_class
+}
+
 # Basic class for multilingual texts
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class MultiLanguageText:
-    """Class for texts with language attributes"""
+    """Class for texts with language attributes
+    
+    Immutable, so that equal texts can be shared between subjects, titles and
+    handlers. Replace the instance to change a text.
+    """
     text: str
     language: Language = Language.CS
     
-    def to_xml_element(self, element_name: str) -> ET.Element:
-        elem = ET.Element(element_name)
+    def to_xml_element(self, element_name: str, builder=etree, parent=None) -> etree._Element:
+        # Attribute is passed at creation instead of a separate set() call
+        attrib = {_XML_LANG: _XML_VALUES[self.language]}
+        if parent is None:
+            elem = builder.Element(element_name, attrib)
+        else:
+            elem = builder.SubElement(parent, element_name, attrib)
         elem.text = self.text
-        elem.set("{http://www.w3.org/XML/1998/namespace}lang", self.language.value)
         return elem
 
 # Identifier
-@dataclass
+@dataclass(**_SLOTS)
 class Identifier:
     """CCMM Identifier"""
     value: str
     scheme: IdentifierScheme
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema identifier"""
-        elem = ET.Element("identifier")
+        elem = _new_element(builder, parent, "identifier")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
-        value_elem = ET.SubElement(elem, "value")
-        value_elem.text = self.value
+            _leaf(builder, elem, "iri", self.iri)
+        _leaf(builder, elem, "value", self.value)
         
         # Scheme element must contain identifier_scheme with iri element
-        scheme_elem = ET.SubElement(elem, "scheme")
-        scheme_iri = ET.SubElement(scheme_elem, "iri")
-        scheme_iri.text = self.scheme.value
+        _iri_wrap(builder, elem, "scheme", _XML_VALUES[self.scheme])
         
         return elem
 
 # Alternate title
-@dataclass
+@dataclass(**_SLOTS)
 class AlternateTitle:
     """CCMM Alternate Title"""
     titles: List[MultiLanguageText]
     alternate_title_type: Optional[str] = None
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
-        elem = ET.Element("alternate_title")
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
+        elem = _new_element(builder, parent, "alternate_title")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         for title in self.titles:
-            elem.append(title.to_xml_element("title"))
+            title.to_xml_element("title", builder, elem)
         if self.alternate_title_type:
-            type_elem = ET.SubElement(elem, "alternate_title_type")
-            type_iri = ET.SubElement(type_elem, "iri")
-            type_iri.text = self.alternate_title_type
+            _iri_wrap(builder, elem, "alternate_title_type", self.alternate_title_type)
         return elem
 
 # Description
-@dataclass
+@dataclass(**_SLOTS)
 class Description:
     """CCMM Description"""
     description_text: str
     description_type: Optional[str] = None
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
-        elem = ET.Element("has_description")
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
+        elem = _new_element(builder, parent, "has_description")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
-        desc_text_elem = ET.SubElement(elem, "description_text")
-        desc_text_elem.text = self.description_text
+            _leaf(builder, elem, "iri", self.iri)
+        _leaf(builder, elem, "description_text", self.description_text)
         if self.description_type:
-            type_elem = ET.SubElement(elem, "has_description_type")
-            type_iri = ET.SubElement(type_elem, "iri")
-            type_iri.text = self.description_type
+            _iri_wrap(builder, elem, "has_description_type", self.description_type)
         return elem
 
 # Subject
-@dataclass
+@dataclass(**_SLOTS)
 class Subject:
     """CCMM Subject"""
     titles: List[MultiLanguageText]
@@ -167,26 +206,22 @@ class Subject:
     definitions: List[MultiLanguageText] = field(default_factory=list)
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
-        elem = ET.Element("subject")
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
+        elem = _new_element(builder, parent, "subject")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         for definition in self.definitions:
-            elem.append(definition.to_xml_element("definition"))
+            definition.to_xml_element("definition", builder, elem)
         for title in self.titles:
-            elem.append(title.to_xml_element("title"))
+            title.to_xml_element("title", builder, elem)
         if self.classification_code:
-            code_elem = ET.SubElement(elem, "classification_code")
-            code_elem.text = self.classification_code
+            _leaf(builder, elem, "classification_code", self.classification_code)
         if self.subject_scheme:
-            scheme_elem = ET.SubElement(elem, "subject_scheme")
-            scheme_iri = ET.SubElement(scheme_elem, "iri")
-            scheme_iri.text = self.subject_scheme.value
+            _iri_wrap(builder, elem, "subject_scheme", _XML_VALUES[self.subject_scheme])
         return elem
 
 # Agent
-@dataclass
+@dataclass(**_SLOTS)
 class Agent:
     """CCMM Agent"""
     name: str
@@ -197,106 +232,96 @@ class Agent:
     iri: Optional[str] = None
 
 # Resource to Agent Relationship
-@dataclass
+@dataclass(**_SLOTS)
 class ResourceToAgentRelationship:
     """CCMM Resource to Agent Relationship"""
     agent: Agent
     role: AgentRole
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema resource-to-agent-relationship"""
-        elem = ET.Element("qualified_relation")
+        elem = _new_element(builder, parent, "qualified_relation")
         
         # According to XSD: iri, role, relation (agent)
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         
         # Role as anyURI
-        role_elem = ET.SubElement(elem, "role")
-        role_elem.text = self.role.value
+        _leaf(builder, elem, "role", _XML_VALUES[self.role])
         
         # Relation contains agent
-        relation_elem = ET.SubElement(elem, "relation")
+        relation_elem = builder.SubElement(elem, "relation")
         
         # Agent has xs:choice between organization and person
         if self.agent.agent_type == AgentType.ORGANIZATION:
-            org_elem = ET.SubElement(relation_elem, "organization")
+            org_elem = builder.SubElement(relation_elem, "organization")
             if self.agent.iri:
-                ET.SubElement(org_elem, "iri").text = self.agent.iri
-            ET.SubElement(org_elem, "name").text = self.agent.name
+                _leaf(builder, org_elem, "iri", self.agent.iri)
+            _leaf(builder, org_elem, "name", self.agent.name)
             if self.agent.identifier:
-                org_elem.append(self.agent.identifier.to_xml_element())
+                self.agent.identifier.to_xml_element(builder, org_elem)
         else:
-            person_elem = ET.SubElement(relation_elem, "person")
+            person_elem = builder.SubElement(relation_elem, "person")
             if self.agent.iri:
-                ET.SubElement(person_elem, "iri").text = self.agent.iri
-            ET.SubElement(person_elem, "name").text = self.agent.name
+                _leaf(builder, person_elem, "iri", self.agent.iri)
+            _leaf(builder, person_elem, "name", self.agent.name)
             if self.agent.identifier:
-                person_elem.append(self.agent.identifier.to_xml_element())
+                self.agent.identifier.to_xml_element(builder, person_elem)
         
         return elem
 
 # Time Reference
-@dataclass
+@dataclass(**_SLOTS)
 class TimeReference:
     """CCMM Time Reference"""
     time_value: str
     time_type: TimeReferenceType
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema time_reference"""
-        elem = ET.Element("time_reference")
+        elem = _new_element(builder, parent, "time_reference")
         
         # According to XSD: xs:choice between time_interval and time_instant
         # For simplicity, we use time_instant
-        instant_elem = ET.SubElement(elem, "time_instant")
+        instant_elem = builder.SubElement(elem, "time_instant")
         
         if self.iri:
-            iri_elem = ET.SubElement(instant_elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, instant_elem, "iri", self.iri)
         
         # date_type is required
-        date_type_elem = ET.SubElement(instant_elem, "date_type")
-        date_type_iri = ET.SubElement(date_type_elem, "iri")
-        date_type_iri.text = self.time_type.value
+        _iri_wrap(builder, instant_elem, "date_type", _XML_VALUES[self.time_type])
         
         # date or date_time (we use date)
-        date_elem = ET.SubElement(instant_elem, "date")
-        date_elem.text = self.time_value
+        _leaf(builder, instant_elem, "date", self.time_value)
         
         return elem
 
 # Location
-@dataclass
+@dataclass(**_SLOTS)
 class Location:
     """CCMM Location"""
     location_value: str
     location_type: LocationType
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema location"""
-        elem = ET.Element("location")
+        elem = _new_element(builder, parent, "location")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         
         # According to XSD: name instead of value
-        name_elem = ET.SubElement(elem, "name")
-        name_elem.text = self.location_value
+        _leaf(builder, elem, "name", self.location_value)
         
         # relation_type is a required element
-        relation_type_elem = ET.SubElement(elem, "relation_type")
-        relation_type_iri = ET.SubElement(relation_type_elem, "iri")
-        relation_type_iri.text = self.location_type.value
+        _iri_wrap(builder, elem, "relation_type", _XML_VALUES[self.location_type])
         
         return elem
 
 # Distribution
-@dataclass
+@dataclass(**_SLOTS)
 class Distribution:
     """CCMM Distribution"""
     access_url: str
@@ -305,42 +330,35 @@ class Distribution:
     description: Optional[str] = None
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema distribution"""
-        elem = ET.Element("distribution")
+        elem = _new_element(builder, parent, "distribution")
         
         # According to XSD: xs:choice between distribution_-_data_service and distribution_-_downloadable_file
         # We use distribution_-_downloadable_file
-        downloadable_elem = ET.SubElement(elem, "distribution_-_downloadable_file")
+        downloadable_elem = builder.SubElement(elem, "distribution_-_downloadable_file")
         
         if self.iri:
-            iri_elem = ET.SubElement(downloadable_elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, downloadable_elem, "iri", self.iri)
         
         # title is required with xml:lang attribute
-        title_elem = ET.SubElement(downloadable_elem, "title")
-        title_elem.text = self.title if self.title else "Dataset file"
-        title_elem.set("{http://www.w3.org/XML/1998/namespace}lang", "cs")
+        _leaf(builder, downloadable_elem, "title", self.title if self.title else "Dataset file",
+              {_XML_LANG: "cs"})
         
         # byte_size is required for downloadable_file
-        byte_size_elem = ET.SubElement(downloadable_elem, "byte_size")
-        byte_size_elem.text = "1000"  # placeholder
+        _leaf(builder, downloadable_elem, "byte_size", "1000")  # placeholder
         
         # access_url is required - type file
-        access_elem = ET.SubElement(downloadable_elem, "access_url")
-        access_iri = ET.SubElement(access_elem, "iri")
-        access_iri.text = self.access_url
+        _iri_wrap(builder, downloadable_elem, "access_url", self.access_url)
         
         # format is required
         if self.format_type:
-            format_elem = ET.SubElement(downloadable_elem, "format")
-            format_iri = ET.SubElement(format_elem, "iri")
-            format_iri.text = self.format_type.value
+            _iri_wrap(builder, downloadable_elem, "format", _XML_VALUES[self.format_type])
         
         return elem
 
 # Terms of Use
-@dataclass
+@dataclass(**_SLOTS)
 class TermsOfUse:
     """CCMM Terms of Use"""
     access_rights: str
@@ -348,33 +366,26 @@ class TermsOfUse:
     iri: Optional[str] = None
     description: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
         """Convert to XML according to XSD schema terms_of_use"""
-        elem = ET.Element("terms_of_use")
+        elem = _new_element(builder, parent, "terms_of_use")
         
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         
         if self.description:
-            desc_elem = ET.SubElement(elem, "description")
-            desc_elem.text = self.description
-            desc_elem.set("{http://www.w3.org/XML/1998/namespace}lang", "cs")
+            _leaf(builder, elem, "description", self.description, {_XML_LANG: "cs"})
         
         # access_rights is required
-        access_elem = ET.SubElement(elem, "access_rights")
-        access_iri = ET.SubElement(access_elem, "iri")
-        access_iri.text = self.access_rights
+        _iri_wrap(builder, elem, "access_rights", self.access_rights)
         
         # license is required
-        license_elem = ET.SubElement(elem, "license")
-        license_iri = ET.SubElement(license_elem, "iri")
-        license_iri.text = self.license_name
+        _iri_wrap(builder, elem, "license", self.license_name)
         
         return elem
 
 # Metadata Record
-@dataclass
+@dataclass(**_SLOTS)
 class MetadataRecord:
     """CCMM Metadata Record"""
     qualified_relations: List[ResourceToAgentRelationship]
@@ -383,32 +394,59 @@ class MetadataRecord:
     languages: List[Language] = field(default_factory=list)
     iri: Optional[str] = None
     
-    def to_xml_element(self) -> ET.Element:
-        elem = ET.Element("is_described_by")
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
+        elem = _new_element(builder, parent, "is_described_by")
         if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
+            _leaf(builder, elem, "iri", self.iri)
         
         for updated in self.date_updated:
-            updated_elem = ET.SubElement(elem, "date_updated")
-            updated_elem.text = updated.isoformat()
+            _leaf(builder, elem, "date_updated", updated.isoformat())
         
         if self.date_created:
-            created_elem = ET.SubElement(elem, "date_created")
-            created_elem.text = self.date_created.isoformat()
+            _leaf(builder, elem, "date_created", self.date_created.isoformat())
         
         for relation in self.qualified_relations:
-            elem.append(relation.to_xml_element())
+            relation.to_xml_element(builder, elem)
         
         for lang in self.languages:
-            lang_elem = ET.SubElement(elem, "language")
-            lang_iri = ET.SubElement(lang_elem, "iri")
-            lang_iri.text = lang.value
+            _iri_wrap(builder, elem, "language", _XML_VALUES[lang])
         
         return elem
 
+# Kinds of dataset children: required text, text left out when empty, model,
+# list of models, enum as <tag><iri/></tag> left out when None, list of enums
+_TEXT, _OPTIONAL_TEXT, _MODEL, _MODELS, _ENUM, _ENUMS = (
+    'text', 'optional_text', 'model', 'models', 'enum', 'enums')
+
+# (attribute, tag, kind) of the dataset children in the XSD order of schema.xsd.
+# Tag is None where the model creates its own element.
+_DATASET_SECTIONS = (
+    ('iri', 'iri', _OPTIONAL_TEXT),                          # 1. volitelné
+    ('publication_year', 'publication_year', _TEXT),         # 2. povinné
+    ('version', 'version', _OPTIONAL_TEXT),                  # 3. volitelné
+    ('title', 'title', _TEXT),                               # 4. povinné
+    ('descriptions', None, _MODELS),                         # 5. has_description, volitelné, více
+    ('alternate_titles', None, _MODELS),                     # 6. alternate_title, volitelné, více
+    ('metadata_records', None, _MODELS),                     # 7. is_described_by, povinné, více
+    ('identifiers', None, _MODELS),                          # 8. identifier, povinné, více
+    ('locations', None, _MODELS),                            # 9. location, volitelné, více
+    # 10. provenance (volitelné, více) - zatím neimplementováno
+    ('qualified_relations', None, _MODELS),                  # 11. qualified_relation, povinné, minimum 2
+    ('time_references', None, _MODELS),                      # 12. time_reference, povinné, více
+    ('subjects', None, _MODELS),                             # 13. subject, povinné, více
+    # 14. validation_result (volitelné, více) - zatím neimplementováno
+    ('distributions', None, _MODELS),                        # 15. distribution, volitelné, více
+    # 16. funding_reference (volitelné, více) - zatím neimplementováno
+    ('terms_of_use', None, _MODEL),                          # 17. povinné
+    # 18. related_resource (volitelné, více) - zatím neimplementováno
+    # 19. resource_type (volitelné) - zatím neimplementováno
+    ('other_languages', 'other_language', _ENUMS),           # 20. volitelné, více
+    ('primary_language', 'primary_language', _ENUM),         # 21. volitelné
+)
+
+
 # Main Dataset class
-@dataclass
+@dataclass(**_SLOTS)
 class Dataset:
     """CCMM Dataset - main class"""
     # Required elements
@@ -431,88 +469,56 @@ class Dataset:
     primary_language: Optional[Language] = None
     other_languages: List[Language] = field(default_factory=list)
     
-    def to_xml_element(self) -> ET.Element:
-        """Convert to XML element according to XSD order"""
-        elem = ET.Element("dataset")
-        
-        # XSD order podle schema.xsd
-        # 1. iri (volitelné)
-        if self.iri:
-            iri_elem = ET.SubElement(elem, "iri")
-            iri_elem.text = self.iri
-        
-        # 2. publication_year (povinné)
-        year_elem = ET.SubElement(elem, "publication_year")
-        year_elem.text = str(self.publication_year)
-        
-        # 3. version (volitelné)
-        if self.version:
-            version_elem = ET.SubElement(elem, "version")
-            version_elem.text = self.version
-        
-        # 4. title (povinné)
-        title_elem = ET.SubElement(elem, "title")
-        title_elem.text = self.title
-        
-        # 5. has_description (volitelné, více)
-        for desc in self.descriptions:
-            elem.append(desc.to_xml_element())
-        
-        # 6. alternate_title (volitelné, více)
-        for alt_title in self.alternate_titles:
-            elem.append(alt_title.to_xml_element())
-        
-        # 7. is_described_by (povinné, více) - metadata records
-        for record in self.metadata_records:
-            elem.append(record.to_xml_element())
-        
-        # 8. identifier (povinné, více)
-        for identifier in self.identifiers:
-            elem.append(identifier.to_xml_element())
-        
-        # 9. location (volitelné, více)
-        for location in self.locations:
-            elem.append(location.to_xml_element())
-        
-        # 10. provenance (volitelné, více) - zatím neimplementováno
-        
-        # 11. qualified_relation (povinné, minimum 2, více)
-        for relation in self.qualified_relations:
-            elem.append(relation.to_xml_element())
-        
-        # 12. time_reference (povinné, více)
-        for time_ref in self.time_references:
-            elem.append(time_ref.to_xml_element())
-        
-        # 13. subject (povinné, více)
-        for subject in self.subjects:
-            elem.append(subject.to_xml_element())
-        
-        # 14. validation_result (volitelné, více) - zatím neimplementováno
-        
-        # 15. distribution (volitelné, více)
-        for distribution in self.distributions:
-            elem.append(distribution.to_xml_element())
-        
-        # 16. funding_reference (volitelné, více) - zatím neimplementováno
-        
-        # 17. terms_of_use (povinné)
-        elem.append(self.terms_of_use.to_xml_element())
-        
-        # 18. related_resource (volitelné, více) - zatím neimplementováno
-        
-        # 19. resource_type (volitelné) - zatím neimplementováno
-        
-        # 20. other_language (volitelné, více)
-        for lang in self.other_languages:
-            lang_elem = ET.SubElement(elem, "other_language")
-            lang_iri = ET.SubElement(lang_elem, "iri")
-            lang_iri.text = lang.value
-        
-        # 21. primary_language (volitelné)
-        if self.primary_language:
-            lang_elem = ET.SubElement(elem, "primary_language")
-            lang_iri = ET.SubElement(lang_elem, "iri")
-            lang_iri.text = self.primary_language.value
-        
+    def to_xml_element(self, builder=etree, parent=None) -> etree._Element:
+        """Convert to XML element according to XSD order
+        
+        Args:
+            builder: ElementTree-compatible module used to create the elements
+                (lxml.etree by default, or xml.etree.ElementTree)
+            parent: Optional element to create the dataset element under
+        """
+        elem = _new_element(builder, parent, "dataset")
+        for _ in self._build_children(builder, elem):
+            pass
         return elem
+    
+    def write_xml(self, file):
+        """Stream the dataset XML to a file without building the whole tree
+        
+        Children of the dataset element are built and written one at a time,
+        so only one of them is held in memory. The output is not indented.
+        
+        Args:
+            file: Path of the output file, or a file object opened in binary mode
+        """
+        scratch = etree.Element("dataset")
+        with etree.xmlfile(file, encoding='UTF-8') as xf:
+            xf.write_declaration()
+            with xf.element("dataset"):
+                for child in self._build_children(etree, scratch):
+                    xf.write(child)
+                    scratch.remove(child)
+    
+    def _build_children(self, builder, elem):
+        """Create the children of the dataset element under elem in XSD order, yielding each one"""
+        for attr, tag, kind in _DATASET_SECTIONS:
+            value = getattr(self, attr)
+            if kind is _MODELS:
+                for item in value:
+                    yield item.to_xml_element(builder, elem)
+            elif kind is _TEXT:
+                yield _leaf(builder, elem, tag, str(value))
+            elif kind is _MODEL:
+                yield value.to_xml_element(builder, elem)
+            elif value:
+                if kind is _OPTIONAL_TEXT:
+                    yield _leaf(builder, elem, tag, value)
+                elif kind is _ENUM:
+                    yield _iri_wrap(builder, elem, tag, _XML_VALUES[value])
+                else:
+                    for member in value:
+                        yield _iri_wrap(builder, elem, tag, _XML_VALUES[member])
+    
+    def to_lxml_element(self) -> etree._Element:
+        """Convert to lxml element according to XSD order (same as to_xml_element with the default builder)"""
+        return self.to_xml_element(etree)
@@ -6,6 +6,13 @@ as a git submodule from the official CCMM repository.
 """
 
 import os
+from typing import Dict, Tuple, Union
+
+from lxml import etree
+
+# Compiled schemas, or the error raised while compiling them, with the
+# modification time of the file they were parsed from
+_SCHEMA_CACHE: Dict[str, Tuple[float, Union[etree.XMLSchema, Exception]]] = {}
 
 def get_schema_path(schema_name: str = "dataset") -> str:
     """
@@ -28,3 +35,32 @@ def get_ccmm_root() -> str:
         Path to the CCMM schemas root directory
     """
     return os.path.join(os.path.dirname(__file__), "CCMM")
+
+def load_schema(xsd_path: str) -> etree.XMLSchema:
+    """
+    Get the compiled XML schema of an XSD file.
+    
+    The schema is parsed once and reused until the modification time of the
+    file changes. Included or imported XSD files are not checked. A schema
+    that fails to compile keeps failing with the same error until the file
+    changes, without being parsed again.
+    
+    Args:
+        xsd_path: Path to the XSD file
+        
+    Returns:
+        Compiled XMLSchema
+    """
+    mtime = os.path.getmtime(xsd_path)
+    cached = _SCHEMA_CACHE.get(xsd_path)
+    if cached is not None and cached[0] == mtime:
+        if isinstance(cached[1], Exception):
+            raise cached[1].with_traceback(None)
+        return cached[1]
+    try:
+        schema = etree.XMLSchema(etree.parse(xsd_path))
+    except (etree.XMLSyntaxError, etree.XMLSchemaParseError) as e:
+        _SCHEMA_CACHE[xsd_path] = (mtime, e)
+        raise
+    _SCHEMA_CACHE[xsd_path] = (mtime, schema)
+    return schema
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Tests of CCMMHandler helpers (bulk update, summary, export)
+"""
+
+from datetime import date
+
+import pytest
+from lxml import etree
+
+from pyccmm.ccmm_handler import CCMMHandler, CCMMValidationError
+from pyccmm.ccmm_models import *
+
+
+def test_bulk_update():
+    handler = CCMMHandler()
+    handler.bulk_update({
+        'title': "Bulk dataset",
+        'publication_year': 2024,
+        'other_languages': [Language.EN, Language.EN, Language.DE],
+        'identifiers': [
+            {'value': "10.1234/bulk", 'scheme': IdentifierScheme.DOI, 'iri': "https://doi.org/10.1234/bulk"},
+            {'value': "ark:/12345/bulk", 'scheme': IdentifierScheme.ARK},
+        ],
+        'subjects': [{'title': "metadata", 'language': Language.EN}],
+        'distributions': [{'access_url': "https://example.com/data.csv", 'format_type': DistributionFormat.CSV}],
+    })
+
+    summary = handler.get_summary()
+    assert summary['title'] == "Bulk dataset"
+    assert summary['identifiers_count'] == 2
+    assert summary['subjects_count'] == 1
+    assert summary['distributions_count'] == 1
+    assert summary['other_languages'] == ['en', 'de']
+
+
+def test_bulk_update_rejects_before_changing_anything():
+    handler = CCMMHandler()
+
+    with pytest.raises(ValueError):
+        handler.bulk_update({'title': "Not applied", 'unknown_field': 1})
+    with pytest.raises(ValueError):
+        handler.bulk_update({
+            'title': "Not applied",
+            'identifiers': [{'value': "x", 'scheme': IdentifierScheme.URL, 'iri': "invalid-uri"}],
+        })
+
+    with pytest.raises(ValueError, match="identifiers"):
+        handler.bulk_update({'title': "Not applied", 'identifiers': ["10.1234/not-a-dict"]})
+
+    assert handler.get_title() == ""
+    assert handler.get_identifiers() == []
+
+
+def test_bulk_update_wraps_malformed_entries_and_applies_in_order():
+    handler = CCMMHandler()
+
+    with pytest.raises(ValueError, match="subjects"):
+        handler.bulk_update({'subjects': [{'title': "metadata", 'no_such_arg': 1}]})
+    with pytest.raises(ValueError, match="other_languages"):
+        handler.bulk_update({'other_languages': 5})
+
+    # Per-field checks run while applying, so preceding keys stay applied
+    with pytest.raises(ValueError):
+        handler.bulk_update({'title': "Applied", 'publication_year': 1})
+    assert handler.get_title() == "Applied"
+
+
+def test_summary_follows_mutations():
+    handler = CCMMHandler()
+    assert handler.get_summary()['identifiers_count'] == 0
+
+    handler.add_identifier("10.1234/test", IdentifierScheme.DOI)
+    handler.set_title("Updated")
+    summary = handler.get_summary()
+    assert summary['identifiers_count'] == 1
+    assert summary['title'] == "Updated"
+
+    # Callers get their own dict, not the cached one
+    summary['title'] = "Changed by caller"
+    summary['other_languages'].append("xx")
+    assert handler.get_summary()['title'] == "Updated"
+    assert handler.get_summary()['other_languages'] == []
+
+
+def test_add_other_language_sees_direct_edits():
+    handler = CCMMHandler()
+    handler.add_other_language(Language.EN)
+    handler.dataset.other_languages.remove(Language.EN)
+    handler.add_other_language(Language.EN)
+    assert handler.dataset.other_languages == [Language.EN]
+
+    handler.dataset = Dataset(
+        title="Replaced", publication_year=2024, identifiers=[], metadata_records=[],
+        qualified_relations=[], time_references=[], subjects=[],
+        terms_of_use=handler.dataset.terms_of_use, other_languages=[Language.DE],
+    )
+    handler.add_other_language(Language.DE)
+    assert handler.dataset.other_languages == [Language.DE]
+
+
+def test_summary_counts_follow_direct_list_edits():
+    handler = CCMMHandler()
+    handler.set_title("Cached title")
+    assert handler.get_summary()['identifiers_count'] == 0
+
+    handler.get_identifiers().append(Identifier(value="10.1234/direct", scheme=IdentifierScheme.DOI))
+    handler.get_descriptions().append(Description(description_text="Direct"))
+    summary = handler.get_summary()
+    assert summary['identifiers_count'] == 1
+    assert summary['descriptions_count'] == 1
+    assert summary['title'] == "Cached title"
+
+    handler.get_identifiers().clear()
+    assert handler.get_summary()['identifiers_count'] == 0
+
+
+def test_save_invalid_dataset_raises_with_error_log(tmp_path):
+    # Schema that accepts only a <nothing/> root, so any dataset fails XSD validation
+    (tmp_path / "dataset").mkdir()
+    (tmp_path / "dataset" / "schema.xsd").write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+        '<xs:element name="nothing"/>'
+        '</xs:schema>'
+    )
+    handler = CCMMHandler(str(tmp_path))
+    handler.bulk_update({
+        'title': "Invalid dataset",
+        'identifiers': [{'value': "10.1234/test", 'scheme': IdentifierScheme.DOI}],
+        'subjects': [{'title': "metadata", 'language': Language.EN}],
+    })
+    handler.add_agent_relationship("Tester", AgentRole.CREATOR)
+    handler.add_time_reference("2024-01-01", TimeReferenceType.CREATED)
+    curator = ResourceToAgentRelationship(agent=Agent(name="Cataloguer", agent_type=AgentType.PERSON),
+                                          role=AgentRole.CURATOR)
+    handler.add_metadata_record(qualified_relations=[curator], date_created=date(2024, 1, 1))
+
+    with pytest.raises(CCMMValidationError) as excinfo:
+        handler.save_to_file(str(tmp_path / "out.xml"))
+    assert excinfo.value.error_log is not None
+    assert len(excinfo.value.error_log) > 0
+    assert not (tmp_path / "out.xml").exists()
+
+
+def test_metadata_record_keeps_own_relations():
+    handler = CCMMHandler()
+    handler.add_agent_relationship("Tester", AgentRole.CREATOR)
+    relationships = handler.get_agent_relationships()
+    assert isinstance(relationships, tuple)
+
+    handler.add_metadata_record(relationships)
+    handler.add_agent_relationship("Publisher", AgentRole.PUBLISHER, AgentType.ORGANIZATION)
+    assert len(handler.get_agent_relationships()) == 2
+    assert len(handler.dataset.metadata_records[0].qualified_relations) == 1
+
+
+def test_write_xml_matches_tree(tmp_path):
+    handler = CCMMHandler()
+    handler.bulk_update({
+        'title': "Streamed dataset",
+        'publication_year': 2024,
+        'identifiers': [{'value': "10.1234/stream", 'scheme': IdentifierScheme.DOI}],
+        'subjects': [{'title': "metadata", 'language': Language.EN}],
+        'distributions': [{'access_url': "https://example.com/data.csv", 'format_type': DistributionFormat.CSV}],
+        'other_languages': [Language.EN],
+    })
+    handler.dataset.write_xml(str(tmp_path / "stream.xml"))
+
+    written = etree.parse(str(tmp_path / "stream.xml")).getroot()
+    assert etree.tostring(written) == etree.tostring(handler.dataset.to_xml_element())
+
+
+def test_shared_texts_are_not_changed_across_handlers():
+    first = CCMMHandler()
+    second = CCMMHandler()
+    first.add_subject("physics", Language.EN)
+    first.add_alternate_title("physics", Language.EN)
+    second.add_subject("physics", Language.EN)
+
+    # Texts are shared between handlers, so they cannot be changed in place
+    with pytest.raises(AttributeError):
+        first.get_subjects()[0].titles[0].text = "chemistry"
+
+    first.get_subjects()[0].titles[0] = MultiLanguageText(text="chemistry", language=Language.EN)
+    assert first.dataset.alternate_titles[0].titles[0].text == "physics"
+    assert second.get_subjects()[0].titles[0].text == "physics"
+    third = CCMMHandler()
+    third.add_subject("physics", Language.EN)
+    assert third.get_subjects()[0].titles[0].text == "physics"
+
+
+def test_load_from_file_is_not_implemented(tmp_path, caplog):
+    handler = CCMMHandler()
+    handler.set_title("Kept")
+    handler.dataset.write_xml(str(tmp_path / "dataset.xml"))
+
+    assert handler.load_from_file(str(tmp_path / "dataset.xml")) is False
+    assert handler.get_title() == "Kept"
+    assert "not implemented" in caplog.text
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests of CCMMMetadataHandler file helpers
+"""
+
+from urllib.parse import urlparse
+
+import pytest
+from lxml import etree
+
+from pyccmm.ccmm_metadata_handler import CCMMMetadataHandler
+
+
+def test_load_summary_from_file(tmp_path):
+    handler = CCMMMetadataHandler()
+    handler.add_alternate_title("Alternate title")
+    handler.set_title("Summary title")
+    handler.set_publication_year(2024)
+    handler.add_identifier("10.1234/summary", "DOI", "https://doi.org/10.1234/summary")
+    handler.add_identifier("ark:/12345/summary", "ARK")
+    handler.save_to_file(str(tmp_path / "metadata.xml"))
+
+    summary = CCMMMetadataHandler().load_summary_from_file(str(tmp_path / "metadata.xml"))
+    assert summary == {
+        'title': "Summary title",
+        'publication_year': "2024",
+        'identifier': [
+            {'value': "10.1234/summary", 'scheme': "DOI", 'iri': "https://doi.org/10.1234/summary"},
+            {'value': "ark:/12345/summary", 'scheme': "ARK"},
+        ],
+    }
+
+
+def test_iter_errors(tmp_path):
+    # Schema requiring an <identifier>, which the handler below does not have
+    (tmp_path / "dataset").mkdir()
+    (tmp_path / "dataset" / "schema.xsd").write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+        '<xs:element name="dataset"><xs:complexType><xs:sequence>'
+        '<xs:element name="title" type="xs:string"/>'
+        '<xs:element name="identifier"><xs:complexType><xs:sequence>'
+        '<xs:any processContents="skip" maxOccurs="unbounded"/>'
+        '</xs:sequence></xs:complexType></xs:element>'
+        '</xs:sequence></xs:complexType></xs:element>'
+        '</xs:schema>'
+    )
+    handler = CCMMMetadataHandler(str(tmp_path))
+    handler.set_title("Only a title")
+
+    errors = list(handler.iter_errors())
+    assert len(errors) == 1
+    assert "identifier" in errors[0].message
+    assert handler.last_error_log is not None
+
+    handler.add_identifier("10.1234/test", "DOI")
+    assert list(handler.iter_errors()) == []
+    assert handler.last_error_log is None
+
+
+def test_setter_after_element_removed_directly():
+    handler = CCMMMetadataHandler()
+    handler.set_title("First title")
+    handler.metadata.remove(handler.metadata.find('title'))
+
+    handler.set_title("Second title")
+    assert handler.get_field_value('title') == "Second title"
+    assert "<title>Second title</title>" in handler.to_xml_string()
+
+    handler.metadata = etree.Element('dataset')
+    handler.set_title("Third title")
+    assert handler.get_field_value('title') == "Third title"
+
+
+@pytest.mark.parametrize("uri, valid", [
+    ("https://example.com/path?q=1#frag", True),
+    ("urn+x.y://host", True),
+    (" http://x.com", True),
+    ("http://  x.com", True),
+    ("http://\tx.com", True),
+    ("http://[::1]/", True),
+    ("http://", False),
+    ("http:///path", False),
+    ("example.com", False),
+    ("mailto:user@example.com", False),
+    ("1http://x.com", False),
+    ("http://\t", False),
+    ("http://[::1/", False),
+    ("   ", False),
+])
+def test_validate_uri_matches_urlparse(uri, valid):
+    # The accepted set is the one of the former urlparse() based check
+    try:
+        result = urlparse(uri)
+        assert bool(uri.strip() and result.scheme and result.netloc) == valid
+    except ValueError:
+        assert not valid
+
+    if valid:
+        CCMMMetadataHandler._validate_uri(uri)
+    else:
+        with pytest.raises(ValueError):
+            CCMMMetadataHandler._validate_uri(uri)
+
+
+def test_elements_are_reordered_once_in_xsd_order(tmp_path):
+    # Schema accepting any children, so is_valid gets to reorder and validate
+    (tmp_path / "dataset").mkdir()
+    (tmp_path / "dataset" / "schema.xsd").write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+        '<xs:element name="dataset"><xs:complexType><xs:sequence>'
+        '<xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>'
+        '</xs:sequence></xs:complexType></xs:element>'
+        '</xs:schema>'
+    )
+    handler = CCMMMetadataHandler(str(tmp_path))
+    handler.add_identifier("first", "DOI")
+    handler.add_description("Description")
+    etree.SubElement(handler.metadata, 'custom_element')
+    handler.add_identifier("second", "ARK")
+    handler.set_publication_year(2024)
+    handler.set_title("Reordered")
+    handler.add_identifier("third", "URL")
+
+    assert handler.is_valid()
+    assert [child.tag for child in handler.metadata] == [
+        'publication_year', 'title', 'has_description',
+        'identifier', 'identifier', 'identifier', 'custom_element',
+    ]
+    assert [identifier.findtext('value') for identifier in handler.metadata.iter('identifier')] == [
+        "first", "second", "third",
+    ]
+
+    # Nothing was added since, so serializing does not sort again
+    handler.metadata.insert(0, handler.metadata.find('custom_element'))
+    assert handler.to_xml_string().index('<custom_element') < handler.to_xml_string().index('<title>')
+
+    # Adding an element sorts on the next serialization again
+    handler.add_description("Another description")
+    handler.to_xml_string()
+    assert [child.tag for child in handler.metadata] == [
+        'publication_year', 'title', 'has_description', 'has_description',
+        'identifier', 'identifier', 'identifier', 'custom_element',
+    ]
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests of the compiled schema cache
+"""
+
+import os
+
+import pytest
+from lxml import etree
+
+from pyccmm.schemas import load_schema
+
+SCHEMA = (
+    '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+    '<xs:element name="{}"/>'
+    '</xs:schema>'
+)
+
+
+def test_load_schema_is_cached_until_the_file_changes(tmp_path):
+    xsd_path = tmp_path / "schema.xsd"
+    xsd_path.write_text(SCHEMA.format("dataset"))
+
+    schema = load_schema(str(xsd_path))
+    assert load_schema(str(xsd_path)) is schema
+
+    xsd_path.write_text(SCHEMA.format("changed"))
+    mtime = os.path.getmtime(xsd_path) + 10
+    os.utime(xsd_path, (mtime, mtime))
+    changed = load_schema(str(xsd_path))
+    assert changed is not schema
+    assert changed.validate(etree.Element("changed"))
+    assert not changed.validate(etree.Element("dataset"))
+
+
+def test_load_schema_repeats_compile_errors(tmp_path):
+    xsd_path = tmp_path / "schema.xsd"
+    xsd_path.write_text('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:element/>')
+
+    with pytest.raises(etree.XMLSyntaxError):
+        load_schema(str(xsd_path))
+    with pytest.raises(etree.XMLSyntaxError):
+        load_schema(str(xsd_path))
+
+    xsd_path.write_text('<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"><xs:element/></xs:schema>')
+    mtime = os.path.getmtime(xsd_path) + 10
+    os.utime(xsd_path, (mtime, mtime))
+    with pytest.raises(etree.XMLSchemaParseError):
+        load_schema(str(xsd_path))
+    with pytest.raises(etree.XMLSchemaParseError):
+        load_schema(str(xsd_path))
@@ -1,67 +1,109 @@
-import zipfile
+import json
 import os
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from itertools import groupby
+from lxml import etree
 
 CCMM_PATH = "../src/pyccmm/schemas/CCMM/"
 HTML_PATH = "xsd_dataset_full.html"
 
+# ==== Předkompilované XPath dotazy ====
+NS = {"xs": "http://www.w3.org/2001/XMLSchema"}
+XP_COMPLEX_TYPES = etree.XPath("xs:complexType", namespaces=NS)
+XP_SIMPLE_TYPES = etree.XPath("xs:simpleType", namespaces=NS)
+XP_GROUPS = etree.XPath("xs:group", namespaces=NS)
+XP_ELEMENTS = etree.XPath("xs:element", namespaces=NS)
+XP_ATTRIBUTES = etree.XPath("xs:attribute", namespaces=NS)
+# První documentation první anotace
+XP_DOC = etree.XPath("xs:annotation[1]/xs:documentation[1]", namespaces=NS)
+XP_ENUM_VALUES = etree.XPath(".//xs:enumeration/@value", namespaces=NS)
+XP_PATTERN = etree.XPath("(.//xs:pattern)[1]", namespaces=NS)
+
+# Názvy XSD značek, jak je vrací .tag
+XS = "{%s}" % NS["xs"]
+NS_SEQUENCE = XS + "sequence"
+NS_CHOICE = XS + "choice"
+NS_ALL = XS + "all"
+NS_GROUP = XS + "group"
+
+# Skupiny prvků: (CSS třída, popisek při najetí, text)
+GROUPS = {
+    NS_SEQUENCE: ("sequence", "Sekvence: prvky musí být uvedeny v přesném pořadí", "🧩 sekvence"),
+    NS_CHOICE: ("choice", "Volba: může být použit pouze jeden z uvedených prvků", "🔀 volba"),
+    NS_ALL: ("all", "Všechny: všechny prvky musí být uvedeny, ale v libovolném pořadí", "📦 všechny"),
+}
+
+# ==== Šablony položek stromu ====
+# Položka prvku: začátek <li>, název, typ, výskyt s povinností, dokumentace
+ELEMENT_TMPL = '%s<span class="nodename">📄 %s</span>%s%s%s'
+TYPE_TMPL = ' <span class="type">%s</span>'
+OCCURS_TMPL = ' <span class="occurs">[%s..%s]</span>'
+OCCURS_REPEAT_TMPL = ' <span class="occurs repeat" title="Vícenásobný výskyt">🔁 [%s..%s]</span>'
+# Podle minOccurs, jiné hodnoty se nevypisují
+ELEMENT_USE = {"0": ' <span class="optional">(volitelné)</span>', "1": ' <span class="required">(povinné)</span>'}
+DOC_TMPL = ' <span class="doc" title="%s">🛈 %s</span>'
+# Položka atributu: název, typ, povinnost, dokumentace
+ATTRIBUTE_TMPL = '<li><span class="attrname">🔑 @%s</span>%s%s%s</li>'
+ATTRIBUTE_REQUIRED = ' <span class="required">(povinný)</span>'
+ATTRIBUTE_OPTIONAL = ' <span class="optional">(volitelný)</span>'
+
+# Escapování textu do HTML jedním průchodem
+_HTML_ESCAPE = str.maketrans({"<": "&lt;", ">": "&gt;", "&": "&amp;", '"': "&quot;"})
+safe = lambda s: (s or "").translate(_HTML_ESCAPE)
+
 # ==== Najdi všechny XSD ====
 xsd_files = {}
+# Typy s podtržítky -> klíč složky s pomlčkami
+aliases = {}
 for root_dir, dirs, files in os.walk(CCMM_PATH):
     for file in files:
         if file == "schema.xsd":
             path = os.path.join(root_dir, file)
             key = os.path.basename(os.path.dirname(path))
+            xsd_files[key] = path
             # Mapuj složky s pomlčkami na typy s podtržítky
             type_name = key.replace("-", "_")
-            xsd_files[type_name] = path
-            # Zachováme i původní klíč pro kompatibilitu
-            xsd_files[key] = path
+            if type_name != key:
+                aliases[type_name] = key
 
 # ==== Načti všechny XSD ====
-parsed_xsds = {}
-for key, path in xsd_files.items():
-    with open(path, "r", encoding="utf-8") as f:
-        parsed_xsds[key] = ET.parse(f).getroot()
+parsed_xsds = {key: etree.parse(path).getroot() for key, path in xsd_files.items()}
+
+# ==== Rejstřík pojmenovaných typů a skupin každého XSD ====
+type_index = {}
+for xsd_root in parsed_xsds.values():
+    type_index[xsd_root] = {
+        kind: {node.attrib.get("name"): node for node in reversed(xpath(xsd_root))}
+        for kind, xpath in (("complexType", XP_COMPLEX_TYPES), ("simpleType", XP_SIMPLE_TYPES), ("group", XP_GROUPS))
+    }
 
 def find_xsd_for_type(type_name):
-    typ = type_name.split(":")[-1]
-    if typ in xsd_files:
-        return parsed_xsds[typ]
-    if typ.startswith("xs") or typ in ["string", "boolean", "gYear", "anyURI"]:
-        return None
-    return None
+    # Pro XSD primitiva a neznámé typy None
+    typ = type_name.rpartition(":")[2]
+    return parsed_xsds.get(aliases.get(typ, typ))
 
 def get_complex_type(xsd_root, type_name):
-    for ctype in xsd_root.findall("{http://www.w3.org/2001/XMLSchema}complexType"):
-        if ctype.attrib.get("name") == type_name:
-            return ctype
-    return None
+    return type_index[xsd_root]["complexType"].get(type_name)
 
 def get_simple_type(xsd_root, type_name):
-    for stype in xsd_root.findall("{http://www.w3.org/2001/XMLSchema}simpleType"):
-        if stype.attrib.get("name") == type_name:
-            return stype
-    return None
+    return type_index[xsd_root]["simpleType"].get(type_name)
 
 def get_group(xsd_root, group_name):
-    for group in xsd_root.findall("{http://www.w3.org/2001/XMLSchema}group"):
-        if group.attrib.get("name") == group_name:
-            return group
+    return type_index[xsd_root]["group"].get(group_name)
+
+def get_documentation(node):
+    documentation = XP_DOC(node)
+    if documentation and documentation[0].text:
+        return documentation[0].text.strip()
     return None
 
 def get_attributes(ctype):
     attrs = []
-    for attr in ctype.findall("{http://www.w3.org/2001/XMLSchema}attribute"):
+    for attr in XP_ATTRIBUTES(ctype):
         name = attr.attrib.get("name")
         typ = attr.attrib.get("type")
         use = attr.attrib.get("use", "optional")
-        annotation = attr.find("{http://www.w3.org/2001/XMLSchema}annotation")
-        doc = None
-        if annotation is not None:
-            documentation = annotation.find("{http://www.w3.org/2001/XMLSchema}documentation")
-            if documentation is not None and documentation.text:
-                doc = documentation.text.strip()
+        doc = get_documentation(attr)
         attrs.append({
             "name": name,
             "type": typ,
@@ -70,243 +112,235 @@ def get_attributes(ctype):
         })
     return attrs
 
-all_enums = {}
+# Úrovně typů vypsané přímo do stránky, hlubší podstromy vloží až prohlížeč při
+# rozbalení. Vyšší hodnota rychle zvětšuje stránku i dobu generování.
+LAZY_DEPTH = 2
+
+# Odložené typy: type_name -> (HTML typu, HTML cyklického odkazu na něj). Podstromy
+# vnořených typů jsou v HTML zase jen zástupci, cesta k nim a kontrola cyklů se
+# doplní v prohlížeči.
+lazy_types = {}
+# Odložené typy, které ještě nejsou v lazy_types
+_lazy_pending = []
+
+def cyclic_html(typ):
+    return f'<li><span class="cyclic">{safe(typ)} ↺ cyklický odkaz (obsah viz výše)</span></li>'
+
+def lazy_stub_html(type_name, path=None):
+    """Zástupce podstromu typu, path jsou názvy předků (doplní je i prohlížeč)"""
+    if type_name not in lazy_types and type_name not in _lazy_pending:
+        _lazy_pending.append(type_name)
+    path_attr = f' data-path="{safe(" ".join(path))}"' if path else ""
+    return f'<li class="lazy" data-type="{safe(type_name)}"{path_attr}></li>'
+
+def render_lazy_types():
+    """Vykreslí všechny odložené typy i typy v nich vnořené"""
+    while _lazy_pending:
+        type_name = _lazy_pending.pop()
+        html = "".join(item if type(item) is str else lazy_stub_html(item[0])
+                       for item in compile_type(type_name))
+        lazy_types[type_name] = (html, cyclic_html(type_name.split(":")[-1]))
 
 # ==== Hlavní strom ====
-def render_expanded_html(type_name, indent=0, path=None):
-    if path is None:
-        path = []
-    typ = type_name.split(":")[-1]
-    ns = "{http://www.w3.org/2001/XMLSchema}"
-    safe = lambda s: (s or "").replace("<", "&lt;").replace(">", "&gt;")
-    # Cykly: povol 1. výskyt, další už ne
-    if typ in path:
-        return f'<li><span class="cyclic">{safe(typ)} ↺ cyklický odkaz (obsah viz výše)</span></li>'
-    new_path = path + [typ]
+# Bez rekurze: každý typ je jednou přeložen (compile_type) na kousky HTML a místa
+# pro vnořené typy, ta se jako úlohy (type_name, cesta) zpracují ze zásobníku.
+# Od hloubky LAZY_DEPTH se místo podstromu vypíše jen zástupce. Kousky se
+# přidávají do seznamu out v pořadí výstupu, ten se vrací a zapisuje do souboru
+# po kouscích.
+def render_expanded_html(type_name):
+    out = []
+    stack = [(type_name, [])]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            out.append(item)
+            continue
+        type_name, path = item
+        typ = type_name.split(":")[-1]
+        # Cykly: povol 1. výskyt, další už ne
+        if typ in path:
+            out.append(cyclic_html(typ))
+            continue
+        if len(path) >= LAZY_DEPTH:
+            out.append(lazy_stub_html(type_name, path))
+            continue
+        new_path = path + [typ]
+        stack.extend(item if type(item) is str else (item[0], new_path)
+                     for item in reversed(compile_type(type_name)))
+    return out
+
+@lru_cache(maxsize=None)
+def compile_type(type_name):
+    """Kousky HTML typu nezávislé na cestě; souvislé řetězce jsou spojené a
+    vnořené typy zůstávají jako n-tice (type_name,)"""
+    items = []
+    render_type_html(type_name, type_name.split(":")[-1], items)
+    compiled = []
+    for is_text, run in groupby(items, key=lambda item: type(item) is str):
+        if is_text:
+            compiled.append("".join(run))
+        else:
+            compiled.extend(run)
+    return tuple(compiled)
+
+def render_type_html(type_name, typ, out):
     xsd_root = find_xsd_for_type(typ)
     if xsd_root is None:
-        return f'<li><span class="primitive">{safe(type_name)}</span></li>'
+        out.append(f'<li><span class="primitive">{safe(type_name)}</span></li>')
+        return
     ctype = get_complex_type(xsd_root, typ)
     stype = get_simple_type(xsd_root, typ)
-    html = ""
     if ctype is not None:
         label = f'<span class="nodename">📄 {safe(typ)} <span class="type">(komplexní typ)</span></span>'
+        out.append(f'<li><span class="caret">{label}</span>')
         attrs = get_attributes(ctype)
-        attrs_html = ""
         if attrs:
-            attrs_html += '<ul class="attributes">'
+            out.append('<ul class="attributes">')
             for attr in attrs:
-                attr_label = f'<span class="attrname">🔑 @{safe(attr["name"])}</span>'
-                if attr.get("type"):
-                    attr_label += f' <span class="type">{safe(attr["type"])}</span>'
-                if attr.get("use") == "required":
-                    attr_label += f' <span class="required">(povinný)</span>'
-                else:
-                    attr_label += f' <span class="optional">(volitelný)</span>'
-                if attr.get("doc"):
-                    attr_label += f' <span class="doc" title="{safe(attr["doc"])}">🛈 {safe(attr["doc"])}</span>'
-                attrs_html += f'<li>{attr_label}</li>'
-            attrs_html += '</ul>'
-        children_html = ""
+                out.append(ATTRIBUTE_TMPL % (
+                    safe(attr["name"]),
+                    TYPE_TMPL % safe(attr["type"]) if attr.get("type") else "",
+                    ATTRIBUTE_REQUIRED if attr.get("use") == "required" else ATTRIBUTE_OPTIONAL,
+                    DOC_TMPL % ((safe(attr["doc"]),) * 2) if attr.get("doc") else "",
+                ))
+            out.append('</ul>')
+        out.append('<ul class="nested">')
         for sub in ctype:
-            if sub.tag == ns + "sequence":
-                children_html += f'<li><span class="group sequence" title="Sekvence: prvky musí být uvedeny v přesném pořadí">🧩 sekvence</span><ul class="nested active">'
-                for elem in sub.findall(ns + "element"):
-                    el_name = elem.attrib.get("name")
-                    el_type = elem.attrib.get("type")
-                    mino = elem.attrib.get("minOccurs", "1")
-                    maxo = elem.attrib.get("maxOccurs", "1")
-                    annotation = elem.find(ns + "annotation")
-                    doc = None
-                    if annotation is not None:
-                        documentation = annotation.find(ns + "documentation")
-                        if documentation is not None and documentation.text:
-                            doc = documentation.text.strip()
-                    occurs = f'[{mino}..{maxo}]'
-                    label2 = f'<span class="nodename">📄 {safe(el_name)}</span>'
-                    if el_type:
-                        label2 += f' <span class="type">{safe(el_type)}</span>'
-                    if maxo == "unbounded" or (maxo.isdigit() and int(maxo) > 1):
-                        label2 += f' <span class="occurs repeat" title="Vícenásobný výskyt">🔁 {occurs}</span>'
-                    else:
-                        label2 += f' <span class="occurs">{occurs}</span>'
-                    if mino == "0":
-                        label2 += f' <span class="optional">(volitelné)</span>'
-                    elif mino == "1":
-                        label2 += f' <span class="required">(povinné)</span>'
-                    if doc:
-                        label2 += f' <span class="doc" title="{safe(doc)}">🛈 {safe(doc)}</span>'
-                    if el_type and not el_type.startswith("xs:"):
-                        children_html += f'<li><span class="caret">{label2}</span><ul class="nested">{render_expanded_html(el_type, indent+3, new_path)}</ul></li>'
-                    else:
-                        children_html += f'<li>{label2}</li>'
-                children_html += "</ul></li>"
-            elif sub.tag == ns + "choice":
-                children_html += f'<li><span class="group choice" title="Volba: může být použit pouze jeden z uvedených prvků">🔀 volba</span><ul class="nested active">'
-                for elem in sub.findall(ns + "element"):
-                    el_name = elem.attrib.get("name")
-                    el_type = elem.attrib.get("type")
-                    mino = elem.attrib.get("minOccurs", "1")
-                    maxo = elem.attrib.get("maxOccurs", "1")
-                    annotation = elem.find(ns + "annotation")
-                    doc = None
-                    if annotation is not None:
-                        documentation = annotation.find(ns + "documentation")
-                        if documentation is not None and documentation.text:
-                            doc = documentation.text.strip()
-                    occurs = f'[{mino}..{maxo}]'
-                    label2 = f'<span class="nodename">📄 {safe(el_name)}</span>'
-                    if el_type:
-                        label2 += f' <span class="type">{safe(el_type)}</span>'
-                    if maxo == "unbounded" or (maxo.isdigit() and int(maxo) > 1):
-                        label2 += f' <span class="occurs repeat">🔁 {occurs}</span>'
-                    else:
-                        label2 += f' <span class="occurs">{occurs}</span>'
-                    if mino == "0":
-                        label2 += f' <span class="optional">(volitelné)</span>'
-                    elif mino == "1":
-                        label2 += f' <span class="required">(povinné)</span>'
-                    if doc:
-                        label2 += f' <span class="doc" title="{safe(doc)}">🛈 {safe(doc)}</span>'
-                    if el_type and not el_type.startswith("xs:"):
-                        children_html += f'<li><span class="caret">{label2}</span><ul class="nested">{render_expanded_html(el_type, indent+3, new_path)}</ul></li>'
-                    else:
-                        children_html += f'<li>{label2}</li>'
-                children_html += "</ul></li>"
-            elif sub.tag == ns + "all":
-                children_html += f'<li><span class="group all" title="Všechny: všechny prvky musí být uvedeny, ale v libovolném pořadí">📦 všechny</span><ul class="nested active">'
-                for elem in sub.findall(ns + "element"):
-                    el_name = elem.attrib.get("name")
-                    el_type = elem.attrib.get("type")
-                    mino = elem.attrib.get("minOccurs", "1")
-                    maxo = elem.attrib.get("maxOccurs", "1")
-                    annotation = elem.find(ns + "annotation")
-                    doc = None
-                    if annotation is not None:
-                        documentation = annotation.find(ns + "documentation")
-                        if documentation is not None and documentation.text:
-                            doc = documentation.text.strip()
-                    occurs = f'[{mino}..{maxo}]'
-                    label2 = f'<span class="nodename">📄 {safe(el_name)}</span>'
-                    if el_type:
-                        label2 += f' <span class="type">{safe(el_type)}</span>'
-                    if maxo == "unbounded" or (maxo.isdigit() and int(maxo) > 1):
-                        label2 += f' <span class="occurs repeat">🔁 {occurs}</span>'
-                    else:
-                        label2 += f' <span class="occurs">{occurs}</span>'
-                    if mino == "0":
-                        label2 += f' <span class="optional">(volitelné)</span>'
-                    elif mino == "1":
-                        label2 += f' <span class="required">(povinné)</span>'
-                    if doc:
-                        label2 += f' <span class="doc" title="{safe(doc)}">🛈 {safe(doc)}</span>'
-                    if el_type and not el_type.startswith("xs:"):
-                        children_html += f'<li><span class="caret">{label2}</span><ul class="nested">{render_expanded_html(el_type, indent+3, new_path)}</ul></li>'
-                    else:
-                        children_html += f'<li>{label2}</li>'
-                children_html += "</ul></li>"
-            elif sub.tag == ns + "group":
-                group_ref = sub.attrib.get("ref")
-                group_typ = group_ref.split(":")[-1]
-                group_xsd = find_xsd_for_type(group_typ)
-                if group_xsd:
-                    group = get_group(group_xsd, group_typ)
-                    if group is not None:
-                        children_html += f'<li><span class="group group" title="Skupina: reference na pojmenovanou skupinu prvků definovanou jinde">🗂️ skupina {safe(group_typ)}</span><ul class="nested active">'
-                        children_html += render_expanded_html(group_typ, indent+2, new_path)
-                        children_html += "</ul></li>"
-                    else:
-                        children_html += f'<li><span class="group group">🗂️ skupina {safe(group_typ)} (nenalezena)</span></li>'
-        html += f'<li><span class="caret">{label}</span>{attrs_html}<ul class="nested">{children_html}</ul></li>'
+            # Komentáře a jiné značky (attribute, annotation) se přeskočí
+            render_child = CHILD_RENDERERS.get(sub.tag)
+            if render_child is not None:
+                render_child(sub, out)
+        out.append('</ul></li>')
     elif stype is not None:
-        enums = []
-        restrictions = stype.findall(".//{http://www.w3.org/2001/XMLSchema}enumeration")
-        for res in restrictions:
-            val = res.attrib.get("value")
-            enums.append(val)
+        enums = [str(val) for val in XP_ENUM_VALUES(stype)]
         if enums:
-            all_enums[typ] = enums
             label = f'<span class="nodename simple">{safe(typ)} <span class="enum">(výčet hodnot)</span></span>'
-            html += f'<li>{label}<ul class="attributes">'
-            for val in enums:
-                html += f'<li><span class="enum">🎯 {safe(val)}</span></li>'
-            html += '</ul></li>'
+            out.append(f'<li>{label}<ul class="attributes">')
+            out.extend(f'<li><span class="enum">🎯 {safe(val)}</span></li>' for val in enums)
+            out.append('</ul></li>')
         else:
             label = f'<span class="nodename simple">{safe(typ)} <span class="primitive">(jednoduchý typ)</span></span>'
-            restr = stype.find(".//{http://www.w3.org/2001/XMLSchema}pattern")
-            if restr is not None:
-                label += f' <span class="pattern">(pattern: {safe(restr.attrib.get("value"))})</span>'
-            html += f'<li>{label}</li>'
+            restr = XP_PATTERN(stype)
+            if restr:
+                label += f' <span class="pattern">(pattern: {safe(restr[0].attrib.get("value"))})</span>'
+            out.append(f'<li>{label}</li>')
     else:
-        html += f'<li><span>{safe(typ)} (definice nenalezena)</span></li>'
-    return html
+        out.append(f'<li><span>{safe(typ)} (definice nenalezena)</span></li>')
+
+def render_compositor_html(sub, out):
+    """Sekvence, volba nebo všechny i s prvky"""
+    css, title, label_text = GROUPS[sub.tag]
+    out.append(f'<li><span class="group {css}" title="{title}">{label_text}</span><ul class="nested active">')
+    for elem in XP_ELEMENTS(sub):
+        render_element_html(elem, out)
+    out.append("</ul></li>")
+
+def render_group_ref_html(sub, out):
+    """Odkaz na pojmenovanou skupinu, její obsah se vloží jako vnořený typ"""
+    group_ref = sub.attrib.get("ref")
+    group_typ = group_ref.split(":")[-1]
+    group_xsd = find_xsd_for_type(group_typ)
+    if group_xsd is not None:
+        group = get_group(group_xsd, group_typ)
+        if group is not None:
+            out.append(f'<li><span class="group group" title="Skupina: reference na pojmenovanou skupinu prvků definovanou jinde">🗂️ skupina {safe(group_typ)}</span><ul class="nested active">')
+            out.append((group_typ,))
+            out.append("</ul></li>")
+        else:
+            out.append(f'<li><span class="group group">🗂️ skupina {safe(group_typ)} (nenalezena)</span></li>')
+
+# Vykreslení potomků komplexního typu podle značky
+CHILD_RENDERERS = {
+    NS_SEQUENCE: render_compositor_html,
+    NS_CHOICE: render_compositor_html,
+    NS_ALL: render_compositor_html,
+    NS_GROUP: render_group_ref_html,
+}
 
-tree_html_full = render_expanded_html("dataset")
+@lru_cache(maxsize=None)
+def occurs_fragment(mino, maxo):
+    """Výskyt [mino..maxo] a povinnost prvku, různých dvojic je v XSD jen pár"""
+    repeat = maxo == "unbounded" or (maxo.isdigit() and int(maxo) > 1)
+    return (OCCURS_REPEAT_TMPL if repeat else OCCURS_TMPL) % (mino, maxo) + ELEMENT_USE.get(mino, "")
 
-# Výpis všech enumů na konec
-enums_section = '<h3>Seznam všech výčtů (enumů) v XSD:</h3><ul>'
-for t, vals in all_enums.items():
-    enums_section += f'<li><b>{t}</b><ul>'
-    for v in vals:
-        enums_section += f'<li><span class="enum">🎯 {v}</span></li>'
-    enums_section += '</ul></li>'
-enums_section += '</ul>'
+def render_element_html(elem, out):
+    """Položka prvku ze sekvence, volby nebo všech, i s rozbaleným typem"""
+    el_name = elem.attrib.get("name")
+    el_type = elem.attrib.get("type")
+    mino = elem.attrib.get("minOccurs", "1")
+    maxo = elem.attrib.get("maxOccurs", "1")
+    doc = get_documentation(elem)
+    expand = el_type and not el_type.startswith("xs:")
+    out.append(ELEMENT_TMPL % (
+        '<li><span class="caret">' if expand else '<li>',
+        safe(el_name),
+        TYPE_TMPL % safe(el_type) if el_type else "",
+        occurs_fragment(mino, maxo),
+        DOC_TMPL % ((safe(doc),) * 2) if doc else "",
+    ))
+    if expand:
+        out.append('</span><ul class="nested">')
+        out.append((el_type,))
+        out.append('</ul>')
+    out.append('</li>')
 
-enums_section = ""
+tree_parts = render_expanded_html("dataset")
+render_lazy_types()
 
 # ===== HTML kód =====
-html_code_full = f"""
+# Stránka bez stromu, ten se zapíše mezi hlavičku a patičku
+html_header = """
 <!DOCTYPE html>
 <html lang="cs">
 <head>
   <meta charset="utf-8">
   <title>XSD Tree - Kompletní in-place strom</title>
   <style>
-    body {{ font-family: Segoe UI, Arial, sans-serif; background: #f9f9f9; color: #222; }}
-    .treeview ul, .treeview li {{ list-style-type: none; }}
-    .treeview {{ margin: 2em; }}
-    .treeview ul {{ margin-left: 1.5em; padding-left: 1em; border-left: 1px dotted #ccc; }}
-    .caret {{ cursor: pointer; user-select: none; }}
-    .caret::before {{ content: "\\25B6"; color: #888; display: inline-block; margin-right: 6px; transition: 0.1s; }}
-    .caret-down::before {{ transform: rotate(90deg); }}
-    .nested {{ display: none; }}
-    .active {{ display: block; }}
-    .nodename {{ font-weight: bold; color: #28507a; }}
-    .nodename.simple {{ color: #777; font-weight: normal; }}
-    .attrname {{ color: #a77d08; font-weight: bold; }}
-    .group.sequence {{ color: #2986cc; font-weight: bold; }}
-    .group.choice {{ color: #bd3800; font-weight: bold; }}
-    .group.all {{ color: #18871b; font-weight: bold; }}
-    .group.group {{ color: #533; font-weight: bold; }}
-    .enum {{ color: #804b2b; font-weight: bold; }}
-    .type {{ color: #468; font-size: 0.95em; margin-left: 0.4em; }}
-    .occurs {{ color: #666; font-size: 0.95em; margin-left: 0.4em; }}
-    .repeat {{ color: #a21c1c; font-weight: bold; }}
-    .required {{ color: #0e730a; font-size: 0.92em; margin-left: 0.2em; }}
-    .optional {{ color: #888; font-size: 0.92em; margin-left: 0.2em; font-style: italic; }}
-    .doc {{ color: #18871b; font-size: 0.96em; margin-left: 0.5em; }}
-    .pattern {{ color: #2b537c; font-size: 0.95em; margin-left: 0.5em; }}
-    .cyclic {{ color: #a21c1c; font-size: 0.95em; margin-left: 0.5em; font-style: italic; }}
-    .primitive {{ color: #2d2043; font-size: 0.98em; }}
-    .attributes {{ margin-left: 2.5em; margin-bottom: 0.2em; padding-left: 0.7em; border-left: 1px dashed #eee; }}
-    li {{ margin-bottom: 0.4em; }}
-    .toolbar {{ margin: 1em 0; }}
-    .toolbar button {{
+    body { font-family: Segoe UI, Arial, sans-serif; background: #f9f9f9; color: #222; }
+    .treeview ul, .treeview li { list-style-type: none; }
+    .treeview { margin: 2em; }
+    .treeview ul { margin-left: 1.5em; padding-left: 1em; border-left: 1px dotted #ccc; }
+    .caret { cursor: pointer; user-select: none; }
+    .caret::before { content: "\\25B6"; color: #888; display: inline-block; margin-right: 6px; transition: 0.1s; }
+    .caret-down::before { transform: rotate(90deg); }
+    .nested { display: none; }
+    .active { display: block; }
+    .nodename { font-weight: bold; color: #28507a; }
+    .nodename.simple { color: #777; font-weight: normal; }
+    .attrname { color: #a77d08; font-weight: bold; }
+    .group.sequence { color: #2986cc; font-weight: bold; }
+    .group.choice { color: #bd3800; font-weight: bold; }
+    .group.all { color: #18871b; font-weight: bold; }
+    .group.group { color: #533; font-weight: bold; }
+    .enum { color: #804b2b; font-weight: bold; }
+    .type { color: #468; font-size: 0.95em; margin-left: 0.4em; }
+    .occurs { color: #666; font-size: 0.95em; margin-left: 0.4em; }
+    .repeat { color: #a21c1c; font-weight: bold; }
+    .required { color: #0e730a; font-size: 0.92em; margin-left: 0.2em; }
+    .optional { color: #888; font-size: 0.92em; margin-left: 0.2em; font-style: italic; }
+    .doc { color: #18871b; font-size: 0.96em; margin-left: 0.5em; }
+    .pattern { color: #2b537c; font-size: 0.95em; margin-left: 0.5em; }
+    .cyclic { color: #a21c1c; font-size: 0.95em; margin-left: 0.5em; font-style: italic; }
+    .primitive { color: #2d2043; font-size: 0.98em; }
+    .attributes { margin-left: 2.5em; margin-bottom: 0.2em; padding-left: 0.7em; border-left: 1px dashed #eee; }
+    li { margin-bottom: 0.4em; }
+    .toolbar { margin: 1em 0; }
+    .toolbar button {
         background: #28507a; color: #fff; font-weight: bold;
         border: none; border-radius: 6px; padding: 6px 16px; margin-right: 12px;
         cursor: pointer; box-shadow: 0 1px 3px #0001;
         transition: background 0.2s;
-    }}
-    .toolbar button:hover {{ background: #18871b; }}
-    .legend {{ margin: 1em 0; padding: 1.5em; background: #f8f9fa; border-radius: 8px; border: 1px solid #e9ecef; }}
-    .legend h3 {{ margin-top: 0; color: #28507a; text-align: center; }}
-    .legend-section {{ margin-bottom: 1.5em; }}
-    .legend-section:last-child {{ margin-bottom: 0; }}
-    .legend-section h4 {{ margin: 0 0 0.8em 0; color: #495057; font-size: 1em; border-bottom: 1px solid #dee2e6; padding-bottom: 0.3em; }}
-    .legend-row {{ display: flex; align-items: flex-start; gap: 1em; margin-bottom: 0.6em; padding: 0.4em 0; }}
-    .legend-row:last-child {{ margin-bottom: 0; }}
-    .legend-desc {{ color: #666; font-size: 0.9em; flex: 1; line-height: 1.4; }}
-    .legend-term {{ font-family: monospace; background: #e9ecef; padding: 0.2em 0.4em; border-radius: 3px; color: #495057; font-weight: bold; }}
+    }
+    .toolbar button:hover { background: #18871b; }
+    .legend { margin: 1em 0; padding: 1.5em; background: #f8f9fa; border-radius: 8px; border: 1px solid #e9ecef; }
+    .legend h3 { margin-top: 0; color: #28507a; text-align: center; }
+    .legend-section { margin-bottom: 1.5em; }
+    .legend-section:last-child { margin-bottom: 0; }
+    .legend-section h4 { margin: 0 0 0.8em 0; color: #495057; font-size: 1em; border-bottom: 1px solid #dee2e6; padding-bottom: 0.3em; }
+    .legend-row { display: flex; align-items: flex-start; gap: 1em; margin-bottom: 0.6em; padding: 0.4em 0; }
+    .legend-row:last-child { margin-bottom: 0; }
+    .legend-desc { color: #666; font-size: 0.9em; flex: 1; line-height: 1.4; }
+    .legend-term { font-family: monospace; background: #e9ecef; padding: 0.2em 0.4em; border-radius: 3px; color: #495057; font-weight: bold; }
   </style>
 </head>
 <body>
@@ -389,35 +423,69 @@ html_code_full = f"""
 <p>(Klikni na název pro rozbalení/zbalení větve. <span class="repeat">🔁</span>)</p>
 <div class="treeview">
   <ul id="tree-root">
-    {tree_html_full}
+    """
+html_footer = """
   </ul>
 </div>
-{enums_section}
 <script>
-function expandAll() {{
+const LAZY_TYPES = """
+html_script = """;
+// Vloží odložený podstrom místo zástupce, typ už zobrazený mezi předky jen jako cyklický odkaz
+function loadStub(stub) {
+    var path = stub.dataset.path ? stub.dataset.path.split(' ') : [];
+    var typ = stub.dataset.type.split(':').pop();
+    var entry = LAZY_TYPES[stub.dataset.type];
+    var tmpl = document.createElement('template');
+    if(path.includes(typ)) {
+        tmpl.innerHTML = entry[1];
+    } else {
+        tmpl.innerHTML = entry[0];
+        var childPath = path.concat(typ).join(' ');
+        tmpl.content.querySelectorAll('li.lazy').forEach(el => el.dataset.path = childPath);
+    }
+    stub.replaceWith(tmpl.content);
+}
+// Vloží podstromy, které se rozbalením seznamu zobrazí, i ve skupinách v něm
+function loadVisible(ul) {
+    ul.querySelectorAll(':scope > li.lazy').forEach(loadStub);
+    ul.querySelectorAll(':scope > li > .nested.active').forEach(loadVisible);
+}
+function expandAll() {
+    var stubs;
+    while ((stubs = document.querySelectorAll('#tree-root li.lazy')).length) {
+        stubs.forEach(loadStub);
+    }
     document.querySelectorAll('.nested').forEach(el => el.classList.add('active'));
     document.querySelectorAll('.caret').forEach(el => el.classList.add('caret-down'));
-}}
-function collapseAll() {{
+}
+function collapseAll() {
     document.querySelectorAll('.nested').forEach(el => el.classList.remove('active'));
     document.querySelectorAll('.caret').forEach(el => el.classList.remove('caret-down'));
-}}
-document.querySelectorAll('.caret').forEach(function(el) {{
-    el.addEventListener('click', function() {{
-        var ul = this.parentElement.querySelector('.nested');
-        if(ul) {{ ul.classList.toggle('active'); }}
-        this.classList.toggle('caret-down');
-    }});
-}});
-document.querySelectorAll('.treeview > ul > li > .caret').forEach(function(el) {{
+}
+document.getElementById('tree-root').addEventListener('click', function(event) {
+    var caret = event.target.closest('.caret');
+    if(!caret) { return; }
+    var ul = caret.parentElement.querySelector('.nested');
+    if(ul) {
+        loadVisible(ul);
+        ul.classList.toggle('active');
+    }
+    caret.classList.toggle('caret-down');
+});
+document.querySelectorAll('.treeview > ul > li > .caret').forEach(function(el) {
     el.click(); // Otevři první úroveň automaticky
-}});
+});
 </script>
 </body>
 </html>
 """
 
 with open(HTML_PATH, "w", encoding="utf-8") as f:
-    f.write(html_code_full)
+    f.write(html_header)
+    f.writelines(tree_parts)
+    f.write(html_footer)
+    # "</" by v řetězci mohlo ukončit <script>
+    f.write(json.dumps(lazy_types, ensure_ascii=False).replace("</", "<\\/"))
+    f.write(html_script)
 
 print(f"✅ Hotovo! Výsledek je v souboru: {HTML_PATH}")